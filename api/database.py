@@ -815,6 +815,49 @@ class RedisClient:
                 logger.exception("Redis EXISTS failed for key '%s'", key)
         return key in _memory_cache
 
+    async def lpush(self, key: str, value: str) -> None:
+        """Push a value onto a list (cross-process signal; no in-memory fallback)."""
+        if self._connected and self._client is not None:
+            try:
+                await self._client.lpush(key, value)
+            except Exception:
+                logger.exception("Redis LPUSH failed for key '%s'", key)
+
+    async def brpop(self, key: str, timeout: int) -> str | None:
+        """Block up to ``timeout`` seconds for a value pushed onto a list.
+
+        Returns None on timeout, or immediately when Redis is unavailable.
+        """
+        if self._connected and self._client is not None:
+            try:
+                item = await self._client.brpop([key], timeout=timeout)
+                return item[1] if item else None
+            except Exception:
+                logger.exception("Redis BRPOP failed for key '%s'", key)
+        return None
+
+    async def xrevrange(self, key: str, count: int) -> list[tuple[str, dict[str, str]]]:
+        """Return up to ``count`` stream entries, newest first.
+
+        Returns an empty list when Redis is unavailable (no in-memory streams).
+        """
+        if self._connected and self._client is not None:
+            try:
+                return await self._client.xrevrange(key, count=count)
+            except Exception:
+                logger.exception("Redis XREVRANGE failed for key '%s'", key)
+        return []
+
+
+# ---------------------------------------------------------------------------
+# Shared Redis keys
+# ---------------------------------------------------------------------------
+
+# Redis list the GitHub webhook handler (api/routers/github_app.py) pushes to
+# after queueing a PR event; the PR comment worker (bot/worker/pr_comments.py)
+# blocks on it between batches
+PR_EVENTS_WAKEUP_KEY = "sigil:github_pr_events:wakeup"
+
 
 # ---------------------------------------------------------------------------
 # Singletons
@@ -0,0 +1,14 @@
+-- Covering index for the bot rescan scheduler
+-- Migration 008: latest scan per package lookup
+-- Azure SQL Database (T-SQL)
+--
+-- bot/rescan.py picks the most recent non-ERROR scan of each package with a
+-- CROSS APPLY (SELECT TOP 1 ... ORDER BY scanned_at DESC). This index turns
+-- each lookup into a seek and covers every column the query reads, so the
+-- scheduler no longer sorts the whole of public_scans every cycle.
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_public_scans_latest')
+    CREATE INDEX IX_public_scans_latest
+        ON public_scans (ecosystem, package_name, scanned_at DESC)
+        INCLUDE (verdict, package_version, metadata_json);
+GO
@@ -309,12 +309,12 @@ async def alerts_feed(
     try:
         from api.database import cache
 
-        raw_alerts = await cache.get("sigil:alerts")
-        if raw_alerts:
+        # The bot appends alerts to a Redis stream (newest last)
+        entries = await cache.xrevrange("sigil:alerts:stream", count=limit)
+        if entries:
             import json as _json
 
-            alerts = _json.loads(f"[{raw_alerts}]") if raw_alerts else []
-            return alerts[:limit]
+            return [_json.loads(fields["alert"]) for _id, fields in entries]
     except Exception:
         pass
 
@@ -26,7 +26,7 @@ from fastapi import APIRouter, HTTPException, Header, Request, status
 from pydantic import BaseModel, Field
 
 from api.config import settings
-from api.database import db
+from api.database import PR_EVENTS_WAKEUP_KEY, cache, db
 
 logger = logging.getLogger(__name__)
 
@@ -371,6 +371,9 @@ async def _handle_pull_request(payload: dict[str, Any], action: str) -> dict[str
         logger.exception(
             "Failed to persist PR event for %s#%d", repo_full_name, pr_number
         )
+    else:
+        # Wake the PR comment worker now instead of at its next poll
+        await cache.lpush(PR_EVENTS_WAKEUP_KEY, event_data["id"])
 
     return {
         "status": "queued",
@@ -583,6 +583,7 @@ BEGIN
         installation_id INT NOT NULL DEFAULT 0,
         status          NVARCHAR(50) NOT NULL DEFAULT 'pending',
         comment_id      NVARCHAR(100),
+        diff_etag       NVARCHAR(255),
         scan_results    NVARCHAR(MAX) DEFAULT '{}',
         created_at      DATETIMEOFFSET NOT NULL DEFAULT SYSDATETIMEOFFSET(),
         processed_at    DATETIMEOFFSET,
@@ -598,3 +599,8 @@ GO
 IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'idx_gh_pr_status')
     CREATE INDEX idx_gh_pr_status ON github_pr_events (status);
 GO
+
+-- Migration: add diff_etag (conditional diff fetches) to existing deployments
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('github_pr_events') AND name = 'diff_etag')
+    ALTER TABLE github_pr_events ADD diff_etag NVARCHAR(255) NULL;
+GO
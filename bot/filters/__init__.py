@@ -83,6 +83,11 @@ AI_SCOPES_NPM: set[str] = {
     "@huggingface",
 }
 
+# Frozen views for the hot filter paths: one C-level ``str.startswith``
+# against every scope prefix, and a fixed tuple for the substring scan.
+_AI_KEYWORDS_SCAN: tuple[str, ...] = tuple(sorted(AI_KEYWORDS))
+_AI_SCOPE_PREFIXES: tuple[str, ...] = tuple(f"{scope}/" for scope in AI_SCOPES_NPM)
+
 # ---------------------------------------------------------------------------
 # Typosquatting Detection
 # ---------------------------------------------------------------------------
@@ -174,15 +179,12 @@ def matches_ai_keywords(
 ) -> bool:
     """Return True if the package metadata matches AI ecosystem keywords."""
     searchable = f"{name} {description} {' '.join(keywords or [])}".lower()
-    return any(kw in searchable for kw in AI_KEYWORDS)
+    return any(map(searchable.__contains__, _AI_KEYWORDS_SCAN))
 
 
 def matches_npm_scope(name: str) -> bool:
     """Return True if the npm package is in a monitored scope."""
-    for scope in AI_SCOPES_NPM:
-        if name.startswith(scope + "/"):
-            return True
-    return False
+    return name.startswith(_AI_SCOPE_PREFIXES)
 
 
 def determine_priority(
@@ -17,15 +17,34 @@ the scan pipeline. The marginal cost is extra DB writes + a dashboard.
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import itertools
 import logging
+from collections.abc import Iterator
 from datetime import datetime, timezone
 from typing import Any
 
-from bot.config import bot_settings
+from bot import jsonutil
+from bot.publisher import _get_redis
 from bot.queue import ScanJob
 
 logger = logging.getLogger(__name__)
 
+# Intel records are buffered in-process and flushed to Redis in batches
+INTEL_QUEUE_KEY = "sigil:intel:queue"
+INTEL_QUEUE_MAX = 10000
+INTEL_FLUSH_BATCH = 100
+INTEL_FLUSH_INTERVAL = 0.5  # seconds
+
+_intel_buffer: asyncio.Queue[bytes | None] | None = None
+_intel_flusher_task: asyncio.Task | None = None
+
+# Detached extraction tasks (strong refs so they are not GC'd mid-flight)
+INTEL_MAX_IN_FLIGHT = 64
+_intel_sem: asyncio.Semaphore | None = None
+_intel_tasks: set[asyncio.Task] = set()
+
 # ---------------------------------------------------------------------------
 # Category signal detection
 # ---------------------------------------------------------------------------
@@ -169,57 +188,122 @@ INFRA_SIGNALS: dict[str, list[str]] = {
 }
 
 
+# (key, needles, env_needles) — env-var-style needles are kept apart so they
+# can be skipped wholesale when the text has no underscore at all.
+_SignalTable = tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...]
+
+
+def _is_env_signal(signal: str) -> bool:
+    """True for env-var-style signals such as ``OPENAI_API_KEY`` or ``AZURE_``."""
+    return signal.isupper() and "_" in signal
+
+
+def _compile_signals(patterns: dict[str, list[str]]) -> _SignalTable:
+    """Lower-case and prune each signal list once at import time.
+
+    A signal that contains a shorter signal of the same key can never be the
+    only match (``from openai import`` implies ``openai``), so it is dropped
+    and never scanned for.
+    """
+    compiled = []
+    for key, signals in patterns.items():
+        env = {signal.lower() for signal in signals if _is_env_signal(signal)}
+        lowered = list(dict.fromkeys(signal.lower() for signal in signals))
+        kept = [
+            needle
+            for needle in lowered
+            if not any(other != needle and other in needle for other in lowered)
+        ]
+        compiled.append(
+            (
+                key,
+                tuple(n for n in kept if n not in env),
+                tuple(n for n in kept if n in env),
+            )
+        )
+    return tuple(compiled)
+
+
+_CATEGORY_SIGNALS = _compile_signals(CATEGORY_PATTERNS)
+_PROVIDER_SIGNALS = _compile_signals(PROVIDER_SIGNALS)
+_INFRA_SIGNALS = _compile_signals(INFRA_SIGNALS)
+
+# Texts shorter than the shortest signal cannot match anything
+_MIN_SIGNAL_LEN = min(
+    len(needle)
+    for table in (_CATEGORY_SIGNALS, _PROVIDER_SIGNALS, _INFRA_SIGNALS)
+    for _key, needles, env_needles in table
+    for needle in needles + env_needles
+)
+
+
 def _detect_signals(
-    patterns: dict[str, list[str]],
+    signals: _SignalTable,
     searchable: str,
+    check_env: bool = True,
 ) -> list[str]:
-    """Return list of matched signal keys."""
+    """Return list of matched signal keys (``searchable`` must be lower-case).
+
+    ``check_env=False`` skips env-var-style needles; callers pass it when the
+    text contains no ``_``, in which case none of them can match.
+    """
     matched = []
-    for key, signals in patterns.items():
-        for signal in signals:
-            if signal.lower() in searchable.lower():
+    for key, needles, env_needles in signals:
+        for needle in needles:
+            if needle in searchable:
                 matched.append(key)
                 break
+        else:
+            if check_env:
+                for needle in env_needles:
+                    if needle in searchable:
+                        matched.append(key)
+                        break
     return matched
 
 
-def _categorise_package(
-    name: str,
-    description: str,
-    keywords: list[str],
-    code_patterns: list[str],
-) -> list[str]:
-    """Determine which categories a package belongs to."""
-    searchable = f"{name} {description} {' '.join(keywords)} {' '.join(code_patterns)}"
-    return _detect_signals(CATEGORY_PATTERNS, searchable)
-
-
-def _detect_providers(findings: list[dict], metadata: dict) -> list[str]:
-    """Detect which LLM providers the package integrates with."""
-    searchable_parts = [
-        metadata.get("description", ""),
-        " ".join(metadata.get("keywords", [])),
-    ]
-    # Extract code snippets from findings
-    for f in findings:
-        searchable_parts.append(f.get("snippet", ""))
-        searchable_parts.append(f.get("rule", ""))
+_Detected = tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]
 
-    searchable = " ".join(searchable_parts)
-    return _detect_signals(PROVIDER_SIGNALS, searchable)
+_SIGNAL_TABLES = (_CATEGORY_SIGNALS, _PROVIDER_SIGNALS, _INFRA_SIGNALS)
 
 
-def _detect_infrastructure(findings: list[dict], metadata: dict) -> list[str]:
-    """Detect which infrastructure the package connects to."""
-    searchable_parts = [
-        metadata.get("description", ""),
-        " ".join(metadata.get("keywords", [])),
-    ]
-    for f in findings:
-        searchable_parts.append(f.get("snippet", ""))
+def _detect_all(searchable: str) -> _Detected:
+    """Detect categories, LLM providers and infrastructure in one text.
+
+    The text is lower-cased once and shared by all three passes.
+    """
+    searchable = searchable.lower()
+    if len(searchable.strip()) < _MIN_SIGNAL_LEN:
+        return (), (), ()
+    check_env = "_" in searchable
+    return tuple(
+        tuple(_detect_signals(table, searchable, check_env)) for table in _SIGNAL_TABLES
+    )
+
+
+@functools.lru_cache(maxsize=8192)
+def _detect_metadata(text: str) -> _Detected:
+    """:func:`_detect_all` memoised for package metadata text.
+
+    Only name/description/keywords go through here: they are short and
+    repeat across versions of a package, unlike finding snippets.
+    """
+    return _detect_all(text)
+
 
-    searchable = " ".join(searchable_parts)
-    return _detect_signals(INFRA_SIGNALS, searchable)
+def _merge_detected(metadata: _Detected, findings: _Detected) -> _Detected:
+    """Union two detections, keeping each signal table's order."""
+    return tuple(
+        tuple(key for key, _, _ in table if key in a or key in b) if b else a
+        for table, a, b in zip(_SIGNAL_TABLES, metadata, findings)
+    )
+
+
+def _iter_finding_texts(findings: list[dict[str, Any]]) -> Iterator[str]:
+    """Yield each finding's snippet and rule in a single pass."""
+    for f in findings:
+        yield f.get("snippet", "")
+        yield f.get("rule", "")
 
 
 async def extract_intelligence(
@@ -241,14 +325,14 @@ async def extract_intelligence(
     if isinstance(keywords, str):
         keywords = keywords.split(",")
 
-    code_snippets = [f.get("snippet", "") for f in findings]
-    code_rules = [f.get("rule", "") for f in findings]
-
-    categories = _categorise_package(
-        job.name, description, keywords, code_snippets + code_rules
+    detected = _detect_metadata(
+        " ".join(itertools.chain((job.name, description), keywords))
     )
-    providers = _detect_providers(findings, metadata)
-    infra = _detect_infrastructure(findings, metadata)
+    if findings:
+        detected = _merge_detected(
+            detected, _detect_all(" ".join(_iter_finding_texts(findings)))
+        )
+    categories, providers, infra = (list(m) for m in detected)
 
     # Build intelligence record
     intel_record = {
@@ -267,17 +351,11 @@ async def extract_intelligence(
         "scanned_at": now.isoformat(),
     }
 
-    # Store in Redis for batch processing (avoids per-scan DB write overhead)
+    # Buffer for batched Redis writes (avoids per-scan DB write overhead)
     try:
-        import redis.asyncio as aioredis
-        import json
-
-        r = aioredis.from_url(bot_settings.redis_url, decode_responses=True)
-        await r.lpush("sigil:intel:queue", json.dumps(intel_record))
-        await r.ltrim("sigil:intel:queue", 0, 9999)
-        await r.aclose()
-    except Exception:
-        logger.debug("Intel record queued locally for %s/%s", job.ecosystem, job.name)
+        _ensure_flusher().put_nowait(jsonutil.dumps(intel_record))
+    except asyncio.QueueFull:
+        logger.debug("Intel buffer full, dropping %s/%s", job.ecosystem, job.name)
 
     logger.debug(
         "Intel extracted: %s/%s — categories=%s providers=%s infra=%s",
@@ -287,3 +365,112 @@ async def extract_intelligence(
         providers,
         infra,
     )
+
+
+def schedule_intelligence(job: ScanJob, scan_output: dict[str, Any]) -> None:
+    """Run extract_intelligence in the background without awaiting it.
+
+    At most ``INTEL_MAX_IN_FLIGHT`` extractions run concurrently; failures
+    are logged and never reach the scan pipeline.
+    """
+    global _intel_sem
+    if _intel_sem is None:
+        _intel_sem = asyncio.Semaphore(INTEL_MAX_IN_FLIGHT)
+
+    async def _run() -> None:
+        async with _intel_sem:
+            try:
+                await extract_intelligence(job, scan_output)
+            except Exception:
+                logger.debug("Intelligence extraction skipped: %s", job.name)
+
+    task = asyncio.create_task(_run())
+    _intel_tasks.add(task)
+    task.add_done_callback(_intel_tasks.discard)
+
+
+# ---------------------------------------------------------------------------
+# Batched Redis flushing
+# ---------------------------------------------------------------------------
+
+
+def _ensure_flusher() -> asyncio.Queue[bytes | None]:
+    """Return the intel buffer, starting the background flusher if needed."""
+    global _intel_buffer, _intel_flusher_task
+    if _intel_buffer is None:
+        _intel_buffer = asyncio.Queue(maxsize=INTEL_QUEUE_MAX)
+    if _intel_flusher_task is None or _intel_flusher_task.done():
+        _intel_flusher_task = asyncio.create_task(
+            _intel_flusher(_intel_buffer), name="intel-flusher"
+        )
+    return _intel_buffer
+
+
+async def _flush_intel(items: list[bytes]) -> None:
+    """Push a batch of intel records with a single variadic LPUSH."""
+    r = await _get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.lpush(INTEL_QUEUE_KEY, *items)
+        pipe.ltrim(INTEL_QUEUE_KEY, 0, INTEL_QUEUE_MAX - 1)
+        await pipe.execute()
+
+
+async def _intel_flusher(buffer: asyncio.Queue[bytes | None]) -> None:
+    """Drain the buffer, flushing when a batch fills or the interval elapses.
+
+    A ``None`` item is the shutdown sentinel: flush what is held and exit.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        item = await buffer.get()
+        stop = item is None
+        items = [] if stop else [item]
+        deadline = loop.time() + INTEL_FLUSH_INTERVAL
+        while not stop and len(items) < INTEL_FLUSH_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(buffer.get(), remaining)
+            except TimeoutError:
+                break
+            if item is None:
+                stop = True
+            else:
+                items.append(item)
+
+        if items:
+            try:
+                await _flush_intel(items)
+            except Exception:
+                logger.debug(
+                    "Failed to flush %d intel records", len(items), exc_info=True
+                )
+        if stop:
+            return
+
+
+async def flush_intelligence() -> None:
+    """Wait for in-flight extractions and flush buffered records (shutdown)."""
+    global _intel_flusher_task
+    if _intel_tasks:
+        await asyncio.gather(*_intel_tasks, return_exceptions=True)
+    if _intel_buffer is None:
+        return
+
+    if _intel_flusher_task is not None and not _intel_flusher_task.done():
+        # Signal rather than cancel so a batch in hand is never dropped
+        await _intel_buffer.put(None)
+        await _intel_flusher_task
+    _intel_flusher_task = None
+
+    items: list[bytes] = []
+    while not _intel_buffer.empty():
+        item = _intel_buffer.get_nowait()
+        if item is not None:
+            items.append(item)
+    if items:
+        try:
+            await _flush_intel(items)
+        except Exception:
+            logger.debug("Failed to flush %d intel records", len(items), exc_info=True)
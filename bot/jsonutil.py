@@ -0,0 +1,35 @@
+"""
+Sigil Bot — JSON helpers
+
+Serialises with orjson when it is installed (C implementation, emits bytes
+directly) and falls back to the stdlib json module otherwise. Redis and the
+HTTP clients accept bytes, so hot paths can skip the str round-trip.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in bot/requirements.txt
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception either way.
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialise ``obj`` to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str, separators=(",", ":")).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from ``str`` or ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
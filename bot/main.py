@@ -127,7 +127,20 @@ async def run_bot(
         task.cancel()
 
     await asyncio.gather(*tasks, return_exceptions=True)
+
+    from bot.intelligence import flush_intelligence
+    from bot.publisher import close_http
+    from bot.redis_pool import close_pool
+    from bot.store import close_db
+    from bot.worker import shutdown_scan_pool
+
+    await flush_intelligence()
+    await asyncio.gather(*(w.aclose() for w in watchers))
+    await close_db()
+    await close_http()
     await queue.disconnect()
+    await close_pool()
+    shutdown_scan_pool()
     logger.info("Sigil Bot stopped.")
 
 
@@ -190,12 +203,26 @@ async def run_backfill(ecosystem: str) -> None:
 
     else:
         logger.error("Unknown ecosystem for backfill: %s", ecosystem)
+        await queue.disconnect()
+        return
 
+    await watcher.aclose()
     await queue.disconnect()
 
 
+def _install_uvloop() -> None:
+    """Use uvloop's libuv-based event loop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 def main() -> None:
     _setup_logging()
+    _install_uvloop()
 
     parser = argparse.ArgumentParser(
         description="Sigil Bot — Registry Monitor & Scanner"
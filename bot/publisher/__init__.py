@@ -11,18 +11,25 @@ Consumes new scan results and updates all downstream surfaces:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import logging
+import re
 import time
 from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Any
 from xml.sax.saxutils import escape as xml_escape
+from xml.sax.saxutils import unescape as xml_unescape
 
 import httpx
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
+from bot import jsonutil
 from bot.config import bot_settings
 from bot.queue import ScanJob
+from bot.redis_pool import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -30,20 +37,105 @@ logger = logging.getLogger(__name__)
 RSS_FEED_KEY = "sigil:rss:items"
 RSS_MAX_ITEMS = 100
 
+# Rendered feeds are cached in one hash (a field per filter combination) —
+# feed readers poll far more often than scans land. Publishing deletes the
+# hash, so the TTL only bounds how long an idle feed's entries linger.
+RSS_RENDERED_KEY = "sigil:rss:rendered"
+RSS_RENDERED_TTL = 30  # seconds
+
+# Per-verdict sorted sets (scored by publish time) so multi-verdict feeds can
+# be merged and ordered by recency inside Redis.
+RSS_VERDICT_ZSET_PREFIX = "sigil:rss:z:verdict"
+RSS_MERGE_PREFIX = "sigil:rss:z:merge"
+RSS_MERGE_TTL = 5  # seconds
+# Sorted-set members are "<guid>\x1f<item xml>" so the merge can dedup on the
+# guid without parsing the XML.
+RSS_GUID_SEP = "\x1f"
+# Set once the sorted sets have been seeded from the per-verdict lists, which
+# hold every item published before the sets existed.
+RSS_ZSET_BACKFILL_KEY = "sigil:rss:z:backfilled"
+_zsets_backfilled = False
+_GUID_RE = re.compile(r"<guid>(.*?)</guid>")
+_PUBDATE_RE = re.compile(r"<pubDate>(.*?)</pubDate>")
+_CATEGORY_RE = re.compile(r"<category>(.*?)</category>")
+
+# Verdicts and ecosystems are a small closed set — escape them once up front
+# and only run xml_escape over the user-supplied fields per item.
+_VERDICT_XML = {
+    v: xml_escape(v) for v in ("LOW_RISK", "MEDIUM_RISK", "HIGH_RISK", "CRITICAL_RISK")
+}
+_ECOSYSTEM_XML = {
+    e: xml_escape(e) for e in ("clawhub", "pypi", "npm", "github", "skills")
+}
+_ECOSYSTEM_UPPER_XML = {e: xml_escape(e.upper()) for e in _ECOSYSTEM_XML}
+
+
+@functools.lru_cache(maxsize=4096)
+def _esc(text: str) -> str:
+    """xml_escape with memoisation — package names and finding descriptions
+    repeat heavily across scans."""
+    return xml_escape(text)
+
+
+_rfc822_second = -1
+_rfc822_text = ""
+
+
+def _rfc822(ts: float) -> str:
+    """RFC 822 date for RSS, formatted at most once per second.
+
+    ``format_datetime`` is locale-independent, unlike ``strftime("%a %b")``.
+    """
+    global _rfc822_second, _rfc822_text
+    second = int(ts)
+    if second != _rfc822_second:
+        _rfc822_text = format_datetime(
+            datetime.fromtimestamp(second, timezone.utc), usegmt=True
+        )
+        _rfc822_second = second
+    return _rfc822_text
+
+
+# High-risk alerts for webhook consumers: a stream read with XREADGROUP (or
+# XREVRANGE for the recent-alerts API), approximately capped in length.
+ALERT_STREAM_KEY = "sigil:alerts:stream"
+ALERT_STREAM_MAXLEN = 1000
+
 # Social rate limiting
 SOCIAL_POST_COUNT_KEY = "sigil:social:post_count"
 SOCIAL_LAST_POST_KEY = "sigil:social:last_post"
 
 _redis: aioredis.Redis | None = None
+_http: httpx.AsyncClient | None = None
 
 
 async def _get_redis() -> aioredis.Redis:
     global _redis
     if _redis is None:
-        _redis = aioredis.from_url(bot_settings.redis_url, decode_responses=True)
+        _redis = get_redis()
     return _redis
 
 
+async def _get_http() -> httpx.AsyncClient:
+    """Shared keep-alive client so revalidations reuse one TLS connection."""
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _http
+
+
+async def close_http() -> None:
+    """Close the shared HTTP client (called on bot shutdown)."""
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
 async def publish_scan(
     scan_id: str,
     job: ScanJob,
@@ -51,21 +143,42 @@ async def publish_scan(
 ) -> None:
     """Publish a completed scan to all downstream surfaces."""
     verdict = scan_output.get("verdict", "LOW_RISK")
-    score = scan_output.get("score", 0.0)
-    scan_output.get("findings", [])
-
-    # 1. Invalidate badge cache (Redis + DB upsert)
-    await _invalidate_badge_cache(job.ecosystem, job.name, job.version, verdict, score)
-
-    # 2. Append to RSS feed
-    await _append_rss(scan_id, job, scan_output)
-
-    # 3. Alert on high-risk findings
-    if verdict in ("HIGH_RISK", "CRITICAL_RISK"):
-        await _dispatch_alert(scan_id, job, scan_output)
+    is_alert = verdict in ("HIGH_RISK", "CRITICAL_RISK")
+
+    # All Redis writes are queued on one pipeline and flushed in a single
+    # round-trip, concurrently with the ISR revalidation request:
+    #   1. Invalidate badge cache
+    #   2. Append to RSS feed
+    #   3. ISR revalidation (fire-and-forget)
+    #   4. Alert on high-risk findings
+    r = await _get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        _invalidate_badge_cache(pipe, job.ecosystem, job.name)
+        _append_rss(pipe, scan_id, job, scan_output)
+        if is_alert:
+            _queue_alert(pipe, scan_id, job, scan_output)
+        sinks = {
+            "redis": pipe.execute(),
+            "revalidation": _trigger_revalidation(job.ecosystem, job.name),
+        }
+        results = await asyncio.gather(*sinks.values(), return_exceptions=True)
+
+    for sink, result in zip(sinks, results):
+        if isinstance(result, BaseException):
+            logger.warning(
+                "Publish sink %s failed for %s (non-fatal)",
+                sink,
+                scan_id,
+                exc_info=result,
+            )
 
-    # 4. ISR revalidation (fire-and-forget)
-    await _trigger_revalidation(job.ecosystem, job.name)
+    if is_alert and not isinstance(results[0], BaseException):
+        try:
+            await _dispatch_alert(job, scan_output)
+        except Exception:
+            logger.warning(
+                "Publish sink alert failed for %s (non-fatal)", scan_id, exc_info=True
+            )
 
     logger.info(
         "Published scan %s: %s/%s@%s → %s",
@@ -77,21 +190,25 @@ async def publish_scan(
     )
 
 
-async def _invalidate_badge_cache(
-    ecosystem: str,
-    name: str,
-    version: str = "",
-    verdict: str = "",
-    score: float = 0.0,
-) -> None:
-    """Clear the cached badge SVG so the next request regenerates it.
+def _capped_lpush(pipe: Pipeline, key: str, value: str | bytes, max_len: int) -> None:
+    """Queue an LPUSH that keeps only the newest ``max_len`` entries of ``key``.
+
+    Plain LPUSH + LTRIM on the caller's pipeline rather than a Lua script: the
+    pair already shares the pipeline's single round-trip, and a registered
+    script would make redis-py add a SCRIPT EXISTS round-trip to every flush.
+    """
+    pipe.lpush(key, value)
+    pipe.ltrim(key, 0, max_len - 1)
+
+
+def _invalidate_badge_cache(pipe: Pipeline, ecosystem: str, name: str) -> None:
+    """Queue removal of the cached badge SVG so the next request regenerates it.
 
     The badge router reads directly from public_scans (which already has the
     latest scan data), so we only need to bust the Redis cache here.
     """
-    r = await _get_redis()
     badge_key = f"badge:{ecosystem}:{name}"
-    await r.delete(badge_key)
+    pipe.delete(badge_key)
 
 
 async def _trigger_revalidation(ecosystem: str, package_name: str) -> None:
@@ -103,85 +220,188 @@ async def _trigger_revalidation(ecosystem: str, package_name: str) -> None:
         return
 
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(
-                bot_settings.revalidation_url,
-                headers={
-                    "x-webhook-secret": bot_settings.revalidation_secret,
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "type": "scan",
-                    "ecosystem": ecosystem,
-                    "package_name": package_name,
-                },
+        client = await _get_http()
+        resp = await client.post(
+            bot_settings.revalidation_url,
+            headers={
+                "x-webhook-secret": bot_settings.revalidation_secret,
+                "Content-Type": "application/json",
+            },
+            json={
+                "type": "scan",
+                "ecosystem": ecosystem,
+                "package_name": package_name,
+            },
+        )
+        if resp.status_code == 200:
+            logger.debug(
+                "ISR revalidation triggered for %s/%s", ecosystem, package_name
+            )
+        else:
+            logger.debug(
+                "ISR revalidation returned %d for %s/%s",
+                resp.status_code,
+                ecosystem,
+                package_name,
             )
-            if resp.status_code == 200:
-                logger.debug(
-                    "ISR revalidation triggered for %s/%s", ecosystem, package_name
-                )
-            else:
-                logger.debug(
-                    "ISR revalidation returned %d for %s/%s",
-                    resp.status_code,
-                    ecosystem,
-                    package_name,
-                )
     except Exception:
         logger.debug("ISR revalidation failed (non-fatal)", exc_info=True)
 
 
-async def _append_rss(
+def _append_rss(
+    pipe: Pipeline,
     scan_id: str,
     job: ScanJob,
     scan_output: dict[str, Any],
 ) -> None:
-    """Append scan result as an RSS <item> to the feed in Redis."""
-    r = await _get_redis()
+    """Queue the scan result as an RSS <item> onto the feeds in Redis."""
     verdict = scan_output.get("verdict", "LOW_RISK")
     score = scan_output.get("score", 0.0)
     findings = scan_output.get("findings", [])
-    now = datetime.now(timezone.utc)
+    now = time.time()
 
-    # Build finding summary using human-readable descriptions
+    # Build finding summary using human-readable descriptions. Escaping is
+    # per character, so escaping each piece equals escaping the joined text.
     finding_summaries = []
     for f in findings[:5]:
         desc = f.get("description", f.get("rule", "unknown"))
         severity = f.get("severity", "MEDIUM")
-        finding_summaries.append(f"{severity}: {desc}")
-    summary = (
+        finding_summaries.append(_esc(f"{severity}: {desc}"))
+    summary_xml = (
         "; ".join(finding_summaries) if finding_summaries else "No notable findings"
     )
 
-    title = f"[{verdict}] {job.name}@{job.version} ({job.ecosystem.upper()})"
-    link = f"https://sigilsec.ai/scans/{job.ecosystem}/{job.name}"
-    description = f"Risk score: {score:.0f}. {len(findings)} finding(s). {summary}."
-
+    ecosystem = job.ecosystem
+    verdict_xml = _VERDICT_XML.get(verdict) or _esc(verdict)
+    eco_xml = _ECOSYSTEM_XML.get(ecosystem) or _esc(ecosystem)
+    eco_upper_xml = _ECOSYSTEM_UPPER_XML.get(ecosystem) or _esc(ecosystem.upper())
+    name_xml = _esc(job.name)
+    version_xml = _esc(job.version)
+    link_xml = f"https://sigilsec.ai/scans/{eco_xml}/{name_xml}"
+    guid_xml = f"{link_xml}?v={version_xml}"
+    pub_date = _rfc822(now)
+
+    # A single f-string compiles to one BUILD_STRING, which sizes and fills
+    # the result in one pass — no intermediate strings to join.
     item_xml = (
         f"<item>"
-        f"<title>{xml_escape(title)}</title>"
-        f"<link>{xml_escape(link)}</link>"
-        f"<description>{xml_escape(description)}</description>"
-        f"<pubDate>{now.strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate>"
-        f"<guid>{xml_escape(link)}?v={xml_escape(job.version)}</guid>"
-        f"<category>{xml_escape(job.ecosystem)}</category>"
-        f"<category>{xml_escape(verdict)}</category>"
+        f"<title>[{verdict_xml}] {name_xml}@{version_xml}"
+        f" ({eco_upper_xml})</title>"
+        f"<link>{link_xml}</link>"
+        f"<description>Risk score: {score:.0f}. {len(findings)} finding(s)."
+        f" {summary_xml}.</description>"
+        f"<pubDate>{pub_date}</pubDate>"
+        f"<guid>{guid_xml}</guid>"
+        f"<category>{eco_xml}</category>"
+        f"<category>{verdict_xml}</category>"
         f"</item>"
     )
 
     # Push to front of list, trim to max
-    await r.lpush(RSS_FEED_KEY, item_xml)
-    await r.ltrim(RSS_FEED_KEY, 0, RSS_MAX_ITEMS - 1)
+    _capped_lpush(pipe, RSS_FEED_KEY, item_xml, RSS_MAX_ITEMS)
+
+    # Every cached feed may now be missing this item
+    pipe.delete(RSS_RENDERED_KEY)
 
     # Also store per-ecosystem for efficient filtered feeds
-    eco_key = f"sigil:rss:items:{job.ecosystem}"
-    await r.lpush(eco_key, item_xml)
-    await r.ltrim(eco_key, 0, RSS_MAX_ITEMS - 1)
+    _capped_lpush(pipe, f"sigil:rss:items:{job.ecosystem}", item_xml, RSS_MAX_ITEMS)
 
     # Also store per-verdict for efficient threat-only feeds
     verdict_key = f"sigil:rss:items:verdict:{verdict.lower()}"
-    await r.lpush(verdict_key, item_xml)
-    await r.ltrim(verdict_key, 0, RSS_MAX_ITEMS - 1)
+    _capped_lpush(pipe, verdict_key, item_xml, RSS_MAX_ITEMS)
+
+    # Scored copy for multi-verdict merges; keep only the newest items
+    # (and per ecosystem + verdict, so combined filters need no client scan)
+    member = {f"{guid_xml}{RSS_GUID_SEP}{item_xml}": now}
+    verdict_zkey = f"{RSS_VERDICT_ZSET_PREFIX}:{verdict.lower()}"
+    eco_verdict_zkey = f"{verdict_zkey}:{job.ecosystem}"
+    for zkey in (verdict_zkey, eco_verdict_zkey):
+        pipe.zadd(zkey, member)
+        pipe.zremrangebyrank(zkey, 0, -(RSS_MAX_ITEMS + 1))
+
+
+async def _backfill_verdict_zsets(r: aioredis.Redis) -> None:
+    """Seed the per-verdict sorted sets (overall and per ecosystem) from the
+    per-verdict and per-ecosystem lists, once.
+
+    List items are scored by their pubDate (less a hair per position, so
+    items from the same second keep the list's order); ZADD NX leaves
+    anything published since the sets appeared at its own score.
+    """
+    global _zsets_backfilled
+    if _zsets_backfilled:
+        return
+    if await r.set(RSS_ZSET_BACKFILL_KEY, "1", nx=True):
+        try:
+            list_keys = [f"sigil:rss:items:verdict:{v.lower()}" for v in _VERDICT_XML]
+            list_keys += [f"sigil:rss:items:{e}" for e in _ECOSYSTEM_XML]
+            async with r.pipeline(transaction=False) as pipe:
+                for key in list_keys:
+                    pipe.lrange(key, 0, -1)
+                lists = await pipe.execute()
+
+            # zkey -> member -> score; an item's categories are its
+            # ecosystem and then its verdict
+            zsets: dict[str, dict[str, float]] = {}
+            for items in lists:
+                for pos, item in enumerate(items):
+                    guid = _GUID_RE.search(item)
+                    pub_date = _PUBDATE_RE.search(item)
+                    categories = _CATEGORY_RE.findall(item)
+                    if not (guid and pub_date and len(categories) == 2):
+                        continue
+                    ts = parsedate_to_datetime(pub_date.group(1)).timestamp()
+                    member = f"{guid.group(1)}{RSS_GUID_SEP}{item}"
+                    eco, verdict = (xml_unescape(c) for c in categories)
+                    zkey = f"{RSS_VERDICT_ZSET_PREFIX}:{verdict.lower()}"
+                    for key in (zkey, f"{zkey}:{eco}"):
+                        zsets.setdefault(key, {}).setdefault(member, ts - pos * 1e-3)
+
+            async with r.pipeline(transaction=False) as pipe:
+                for zkey, members in zsets.items():
+                    pipe.zadd(zkey, members, nx=True)
+                    pipe.zremrangebyrank(zkey, 0, -(RSS_MAX_ITEMS + 1))
+                await pipe.execute()
+        except Exception:
+            # Let the next feed request try again
+            await r.delete(RSS_ZSET_BACKFILL_KEY)
+            raise
+        logger.info("Backfilled RSS verdict sorted sets from the feed lists")
+    _zsets_backfilled = True
+
+
+async def _recent_verdict_items(
+    r: aioredis.Redis,
+    verdicts: list[str],
+    max_items: int,
+    ecosystem: str | None = None,
+) -> list[str]:
+    """Newest items across the per-verdict sorted sets, deduplicated by guid.
+
+    Redis merges the sets and orders them by recency; ``ecosystem`` narrows the
+    read to that ecosystem's per-verdict sets.
+    """
+    merged = sorted(set(verdicts))
+    if not merged:
+        return []
+    await _backfill_verdict_zsets(r)
+    suffix = f":{ecosystem}" if ecosystem else ""
+    zkeys = [f"{RSS_VERDICT_ZSET_PREFIX}:{v}{suffix}" for v in merged]
+    merge_key = f"{RSS_MERGE_PREFIX}:{'+'.join(merged)}{suffix}"
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.zunionstore(merge_key, zkeys, aggregate="MAX")
+        pipe.zrevrange(merge_key, 0, max_items - 1)
+        pipe.expire(merge_key, RSS_MERGE_TTL)
+        _, members, _ = await pipe.execute()
+
+    seen: set[str] = set()
+    items: list[str] = []
+    for member in members:
+        guid, _, item = member.partition(RSS_GUID_SEP)
+        if guid not in seen:
+            seen.add(guid)
+            items.append(item)
+    return items
 
 
 async def generate_rss_feed(
@@ -195,10 +415,18 @@ async def generate_rss_feed(
       - ecosystem="clawhub" → only ClawHub scans
       - verdict_filter="high_risk,critical_risk" → threats only
       - Both can be combined
+
+    The rendered XML is cached in Redis per (ecosystem, verdict_filter,
+    limit) combination until the next scan is published.
     """
     r = await _get_redis()
     max_items = min(limit, RSS_MAX_ITEMS)
 
+    cache_field = f"{ecosystem}:{verdict_filter}:{max_items}"
+    cached = await r.hget(RSS_RENDERED_KEY, cache_field)
+    if cached:
+        return cached
+
     # Determine which Redis key to read from
     if ecosystem and not verdict_filter:
         # Fast path: per-ecosystem list
@@ -213,33 +441,13 @@ async def generate_rss_feed(
             key = f"sigil:rss:items:verdict:{verdicts[0]}"
             items = await r.lrange(key, 0, max_items - 1)
         else:
-            # Multi-verdict: merge from per-verdict lists and sort by recency
-            items = []
-            for v in verdicts:
-                key = f"sigil:rss:items:verdict:{v}"
-                items.extend(await r.lrange(key, 0, max_items - 1))
-            # Deduplicate by guid and take the most recent
-            seen: set[str] = set()
-            unique: list[str] = []
-            for item in items:
-                # Extract guid as dedup key
-                guid_start = item.find("<guid>")
-                guid_end = item.find("</guid>")
-                guid = item[guid_start:guid_end] if guid_start >= 0 else item
-                if guid not in seen:
-                    seen.add(guid)
-                    unique.append(item)
-            items = unique[:max_items]
+            # Multi-verdict: merged by recency inside Redis
+            items = await _recent_verdict_items(r, verdicts, max_items)
 
     elif ecosystem and verdict_filter:
-        # Both filters: read per-ecosystem, then filter by verdict
-        key = f"sigil:rss:items:{ecosystem}"
-        items = await r.lrange(key, 0, RSS_MAX_ITEMS - 1)
-        allowed_verdicts = {v.strip().upper() for v in verdict_filter.split(",")}
-        items = [
-            item for item in items if any(f"[{v}]" in item for v in allowed_verdicts)
-        ]
-        items = items[:max_items]
+        # Both filters: per-ecosystem verdict sets, merged inside Redis
+        verdicts = [v.strip().lower() for v in verdict_filter.split(",") if v.strip()]
+        items = await _recent_verdict_items(r, verdicts, max_items, ecosystem)
 
     else:
         # No filter: all items
@@ -255,31 +463,36 @@ async def generate_rss_feed(
         title_parts.append("— Threat Alerts")
     channel_title = " ".join(title_parts)
 
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
+    rendered = f"""<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0">
   <channel>
     <title>{xml_escape(channel_title)}</title>
     <link>https://sigilsec.ai/scans</link>
     <description>Automated security scan results for AI agent packages. Learn more at https://sigilsec.ai/bot</description>
     <language>en-us</language>
-    <lastBuildDate>{datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")}</lastBuildDate>
+    <lastBuildDate>{_rfc822(time.time())}</lastBuildDate>
     {items_xml}
   </channel>
 </rss>"""
 
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.hset(RSS_RENDERED_KEY, cache_field, rendered)
+        pipe.expire(RSS_RENDERED_KEY, RSS_RENDERED_TTL)
+        await pipe.execute()
+    return rendered
 
-async def _dispatch_alert(
+
+def _queue_alert(
+    pipe: Pipeline,
     scan_id: str,
     job: ScanJob,
     scan_output: dict[str, Any],
 ) -> None:
-    """Dispatch alerts for HIGH_RISK / CRITICAL_RISK findings."""
+    """Queue a HIGH_RISK / CRITICAL_RISK alert for webhook consumers."""
     verdict = scan_output.get("verdict", "")
     score = scan_output.get("score", 0.0)
     findings = scan_output.get("findings", [])
 
-    # Store alert in Redis for webhook consumers
-    r = await _get_redis()
     alert = {
         "scan_id": scan_id,
         "ecosystem": job.ecosystem,
@@ -291,8 +504,19 @@ async def _dispatch_alert(
         "url": f"https://sigilsec.ai/scans/{job.ecosystem}/{job.name}",
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
-    await r.lpush("sigil:alerts", json.dumps(alert))
-    await r.ltrim("sigil:alerts", 0, 999)
+    pipe.xadd(
+        ALERT_STREAM_KEY,
+        {"alert": jsonutil.dumps(alert)},
+        maxlen=ALERT_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def _dispatch_alert(job: ScanJob, scan_output: dict[str, Any]) -> None:
+    """Report an alert that has been stored by ``_queue_alert``."""
+    verdict = scan_output.get("verdict", "")
+    score = scan_output.get("score", 0.0)
+    findings = scan_output.get("findings", [])
 
     logger.warning(
         "ALERT: %s %s/%s@%s — score=%.0f, findings=%d",
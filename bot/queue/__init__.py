@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import time
 import uuid
@@ -11,8 +10,11 @@ from enum import Enum
 from typing import Any
 
 import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
 
+from bot import jsonutil
 from bot.config import bot_settings
+from bot.redis_pool import get_redis
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,51 @@ DEAD_LETTER = f"{QUEUE_PREFIX}:dead_letter"
 DEDUP_SET = "sigil:dedup"
 CHECKPOINT_PREFIX = "sigil:checkpoint"
 
+# Pops from the first non-empty queue in KEYS order — one round-trip for the
+# priority probe without draining the lower-priority queues.
+_PRIORITY_POP_LUA = """
+for _, key in ipairs(KEYS) do
+    local job = redis.call('RPOP', key)
+    if job then
+        return job
+    end
+end
+return false
+"""
+
+# Dedup check, push and dedup-set insert as one atomic step: returns 1 when
+# the job was enqueued, 0 when its dedup key was already present.
+_DEDUP_ENQUEUE_LUA = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 1 then
+    return 0
+end
+redis.call('LPUSH', KEYS[2], ARGV[2])
+redis.call('SADD', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Moves up to ARGV[2] retry jobs due by ARGV[1] from the retry zset (KEYS[1])
+# onto their priority queue (KEYS[2..4] = critical, high, normal) atomically,
+# so concurrent workers never promote the same job twice.
+PROMOTE_BATCH = 500
+_PROMOTE_DELAYED_LUA = """
+local ready = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2])
+)
+for _, data in ipairs(ready) do
+    local priority = cjson.decode(data)['priority']
+    local queue_key = KEYS[4]
+    if priority == 'critical' then
+        queue_key = KEYS[2]
+    elseif priority == 'high' then
+        queue_key = KEYS[3]
+    end
+    redis.call('LPUSH', queue_key, data)
+    redis.call('ZREM', KEYS[1], data)
+end
+return #ready
+"""
+
 
 class Priority(str, Enum):
     CRITICAL = "critical"
@@ -33,9 +80,23 @@ class Priority(str, Enum):
     NORMAL = "normal"
 
 
-@dataclass
+# Unknown priorities fall back to the normal queue; "low" (used by the rescan
+# scheduler) shares it deliberately.
+_QUEUE_KEY_BY_PRIORITY = {
+    Priority.CRITICAL.value: QUEUE_CRITICAL,
+    Priority.HIGH.value: QUEUE_HIGH,
+    Priority.NORMAL.value: QUEUE_NORMAL,
+    "low": QUEUE_NORMAL,
+}
+
+
+@dataclass(slots=True)
 class ScanJob:
-    """A scan job payload."""
+    """A scan job payload.
+
+    ``dedup_key`` is computed once at construction; jobs are not mutated in
+    ways that affect it (only ``retries``/``enqueued_at`` change later).
+    """
 
     id: str = field(default_factory=lambda: f"scan_{uuid.uuid4().hex[:12]}")
     ecosystem: str = ""
@@ -47,32 +108,37 @@ class ScanJob:
     enqueued_at: str = ""
     retries: int = 0
     max_retries: int = 3
+    _dedup_key: str = field(init=False, repr=False, compare=False)
 
-    def to_json(self) -> str:
-        return json.dumps(
-            {
-                "id": self.id,
-                "ecosystem": self.ecosystem,
-                "name": self.name,
-                "version": self.version,
-                "download_url": self.download_url,
-                "metadata": self.metadata,
-                "priority": self.priority,
-                "enqueued_at": self.enqueued_at,
-                "retries": self.retries,
-                "max_retries": self.max_retries,
-            }
-        )
+    def __post_init__(self) -> None:
+        content_hash = self.metadata.get("content_hash", "")
+        self._dedup_key = f"{self.ecosystem}:{self.name}:{self.version}:{content_hash}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "ecosystem": self.ecosystem,
+            "name": self.name,
+            "version": self.version,
+            "download_url": self.download_url,
+            "metadata": self.metadata,
+            "priority": self.priority,
+            "enqueued_at": self.enqueued_at,
+            "retries": self.retries,
+            "max_retries": self.max_retries,
+        }
+
+    def to_json(self) -> bytes:
+        return jsonutil.dumps(self.to_dict())
 
     @classmethod
-    def from_json(cls, data: str) -> ScanJob:
-        d = json.loads(data)
+    def from_json(cls, data: str | bytes) -> ScanJob:
+        d = jsonutil.loads(data)
         return cls(**d)
 
     @property
     def dedup_key(self) -> str:
-        content_hash = self.metadata.get("content_hash", "")
-        return f"{self.ecosystem}:{self.name}:{self.version}:{content_hash}"
+        return self._dedup_key
 
 
 class JobQueue:
@@ -80,10 +146,17 @@ class JobQueue:
 
     def __init__(self) -> None:
         self._redis: aioredis.Redis | None = None
+        self._priority_pop: AsyncScript | None = None
+        self._dedup_enqueue: AsyncScript | None = None
+        self._promote_delayed: AsyncScript | None = None
 
     async def connect(self) -> None:
-        self._redis = aioredis.from_url(bot_settings.redis_url, decode_responses=True)
+        # Raw bytes replies: job payloads go straight to the JSON parser
+        self._redis = get_redis(decode_responses=False)
         await self._redis.ping()
+        self._priority_pop = self._redis.register_script(_PRIORITY_POP_LUA)
+        self._dedup_enqueue = self._redis.register_script(_DEDUP_ENQUEUE_LUA)
+        self._promote_delayed = self._redis.register_script(_PROMOTE_DELAYED_LUA)
         logger.info("Queue connected to Redis at %s", bot_settings.redis_url)
 
     async def disconnect(self) -> None:
@@ -91,29 +164,25 @@ class JobQueue:
             await self._redis.aclose()
 
     def _queue_key(self, priority: str) -> str:
-        if priority == Priority.CRITICAL:
-            return QUEUE_CRITICAL
-        if priority == Priority.HIGH:
-            return QUEUE_HIGH
-        return QUEUE_NORMAL
+        return _QUEUE_KEY_BY_PRIORITY.get(priority, QUEUE_NORMAL)
 
     async def enqueue(self, job: ScanJob) -> bool:
         """Add a job to the queue. Returns False if deduplicated."""
-        assert self._redis
-        # Dedup check
-        if await self._redis.sismember(DEDUP_SET, job.dedup_key):
-            logger.debug("Dedup: skipping %s", job.dedup_key)
-            return False
-
+        assert self._dedup_enqueue
         if not job.enqueued_at:
             from datetime import datetime, timezone
 
             job.enqueued_at = datetime.now(timezone.utc).isoformat()
 
         queue_key = self._queue_key(job.priority)
-        # Use LPUSH so RPOP gives FIFO within each priority
-        await self._redis.lpush(queue_key, job.to_json())
-        await self._redis.sadd(DEDUP_SET, job.dedup_key)
+        # Dedup check + LPUSH (so RPOP gives FIFO within each priority)
+        enqueued = await self._dedup_enqueue(
+            keys=[DEDUP_SET, queue_key], args=[job.dedup_key, job.to_json()]
+        )
+        if not enqueued:
+            logger.debug("Dedup: skipping %s", job.dedup_key)
+            return False
+
         logger.info(
             "Enqueued %s %s@%s [%s]",
             job.ecosystem,
@@ -123,17 +192,52 @@ class JobQueue:
         )
         return True
 
+    async def enqueue_many(self, jobs: list[ScanJob]) -> int:
+        """Add several jobs in one round-trip. Returns how many were enqueued."""
+        assert self._redis and self._dedup_enqueue
+        if not jobs:
+            return 0
+        from datetime import datetime, timezone
+
+        now = datetime.now(timezone.utc).isoformat()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for job in jobs:
+                if not job.enqueued_at:
+                    job.enqueued_at = now
+                await self._dedup_enqueue(
+                    keys=[DEDUP_SET, self._queue_key(job.priority)],
+                    args=[job.dedup_key, job.to_json()],
+                    client=pipe,
+                )
+            results = await pipe.execute()
+
+        enqueued = 0
+        for job, result in zip(jobs, results):
+            if not result:
+                logger.debug("Dedup: skipping %s", job.dedup_key)
+                continue
+            enqueued += 1
+            logger.info(
+                "Enqueued %s %s@%s [%s]",
+                job.ecosystem,
+                job.name,
+                job.version,
+                job.priority,
+            )
+        return enqueued
+
     async def dequeue(self, timeout: int = 30) -> ScanJob | None:
         """Pop the highest-priority job. Blocks up to `timeout` seconds."""
-        assert self._redis
+        assert self._redis and self._priority_pop
         # Check queues in priority order
-        for queue_key in [QUEUE_CRITICAL, QUEUE_HIGH, QUEUE_NORMAL]:
-            result = await self._redis.rpop(queue_key)
-            if result:
-                job = ScanJob.from_json(result)
-                # Track as processing
-                await self._redis.hset(PROCESSING_SET, job.id, str(int(time.time())))
-                return job
+        result = await self._priority_pop(
+            keys=[QUEUE_CRITICAL, QUEUE_HIGH, QUEUE_NORMAL]
+        )
+        if result:
+            job = ScanJob.from_json(result)
+            # Track as processing
+            await self._redis.hset(PROCESSING_SET, job.id, str(int(time.time())))
+            return job
 
         # If all empty, block-wait on all three (BRPOP)
         result = await self._redis.brpop(
@@ -154,15 +258,18 @@ class JobQueue:
     async def retry(self, job: ScanJob) -> None:
         """Re-enqueue a job with incremented retry count."""
         assert self._redis
-        await self._redis.hdel(PROCESSING_SET, job.id)
         job.retries += 1
         # Exponential backoff: add delay score
         delay_map = {1: 60, 2: 300, 3: 1800}
         delay = delay_map.get(job.retries, 1800)
-        # Use a sorted set for delayed retry
+        # Use a sorted set for delayed retry; the processing-set removal and
+        # the retry insert go out together in one MULTI round-trip.
         retry_key = f"{QUEUE_PREFIX}:retry"
         score = time.time() + delay
-        await self._redis.zadd(retry_key, {job.to_json(): score})
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(PROCESSING_SET, job.id)
+            pipe.zadd(retry_key, {job.to_json(): score})
+            await pipe.execute()
         logger.warning(
             "Retry #%d for %s %s@%s in %ds",
             job.retries,
@@ -175,15 +282,17 @@ class JobQueue:
     async def dead_letter(self, job: ScanJob, error: str) -> None:
         """Move a job to the dead-letter queue."""
         assert self._redis
-        await self._redis.hdel(PROCESSING_SET, job.id)
-        payload = json.dumps(
+        payload = jsonutil.dumps(
             {
-                "job": json.loads(job.to_json()),
+                "job": job.to_dict(),
                 "error": error,
                 "dead_at": time.time(),
             }
         )
-        await self._redis.lpush(DEAD_LETTER, payload)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(PROCESSING_SET, job.id)
+            pipe.lpush(DEAD_LETTER, payload)
+            await pipe.execute()
         logger.error(
             "Dead-lettered %s %s@%s: %s",
             job.ecosystem,
@@ -194,18 +303,13 @@ class JobQueue:
 
     async def promote_delayed(self) -> int:
         """Move delayed-retry jobs whose time has come back into the main queue."""
-        assert self._redis
+        assert self._promote_delayed
         retry_key = f"{QUEUE_PREFIX}:retry"
         now = time.time()
-        ready = await self._redis.zrangebyscore(retry_key, "-inf", str(now))
-        count = 0
-        for data in ready:
-            job = ScanJob.from_json(data)
-            queue_key = self._queue_key(job.priority)
-            await self._redis.lpush(queue_key, job.to_json())
-            await self._redis.zrem(retry_key, data)
-            count += 1
-        return count
+        return await self._promote_delayed(
+            keys=[retry_key, QUEUE_CRITICAL, QUEUE_HIGH, QUEUE_NORMAL],
+            args=[str(now), PROMOTE_BATCH],
+        )
 
     # -- Checkpoint persistence -------------------------------------------------
 
@@ -217,17 +321,25 @@ class JobQueue:
     async def load_checkpoint(self, watcher_name: str) -> str | None:
         """Load a watcher checkpoint."""
         assert self._redis
-        return await self._redis.get(f"{CHECKPOINT_PREFIX}:{watcher_name}")
+        value = await self._redis.get(f"{CHECKPOINT_PREFIX}:{watcher_name}")
+        return value.decode() if value is not None else None
 
     # -- Monitoring helpers -----------------------------------------------------
 
     async def queue_depth(self) -> dict[str, int]:
         """Return current queue lengths."""
         assert self._redis
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.llen(QUEUE_CRITICAL)
+            pipe.llen(QUEUE_HIGH)
+            pipe.llen(QUEUE_NORMAL)
+            pipe.hlen(PROCESSING_SET)
+            pipe.llen(DEAD_LETTER)
+            critical, high, normal, processing, dead = await pipe.execute()
         return {
-            "critical": await self._redis.llen(QUEUE_CRITICAL),
-            "high": await self._redis.llen(QUEUE_HIGH),
-            "normal": await self._redis.llen(QUEUE_NORMAL),
-            "processing": await self._redis.hlen(PROCESSING_SET),
-            "dead_letter": await self._redis.llen(DEAD_LETTER),
+            "critical": critical,
+            "high": high,
+            "normal": normal,
+            "processing": processing,
+            "dead_letter": dead,
         }
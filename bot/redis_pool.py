@@ -0,0 +1,51 @@
+"""
+Sigil Bot — Shared Redis connection pools
+
+The queue, publisher and intelligence layers all talk to the same Redis. They
+share lazily-created connection pools so concurrent coroutines reuse sockets
+instead of each module opening (and, on reconnect, re-opening) its own set.
+
+There is one pool per response mode: the publisher and intelligence layers
+work with ``str`` replies, while the job queue reads raw ``bytes`` so job
+payloads go straight to the JSON parser without a UTF-8 decode.
+"""
+
+from __future__ import annotations
+
+import redis.asyncio as aioredis
+
+from bot.config import bot_settings
+
+_pools: dict[bool, aioredis.ConnectionPool] = {}
+
+
+def get_pool(decode_responses: bool = True) -> aioredis.ConnectionPool:
+    """Return the process-wide Redis connection pool, creating it on first use."""
+    pool = _pools.get(decode_responses)
+    if pool is None:
+        # Sized for concurrent publish fan-out (several commands per scan per
+        # worker), blocking dequeues and the intel flusher.
+        pool = aioredis.ConnectionPool.from_url(
+            bot_settings.redis_url,
+            max_connections=max(64, 2 * bot_settings.max_concurrent_scans),
+            health_check_interval=30,
+            decode_responses=decode_responses,
+        )
+        _pools[decode_responses] = pool
+    return pool
+
+
+def get_redis(decode_responses: bool = True) -> aioredis.Redis:
+    """Return a Redis client backed by the shared pool.
+
+    Clients are cheap wrappers; closing one does not close the pool.
+    """
+    return aioredis.Redis(connection_pool=get_pool(decode_responses))
+
+
+async def close_pool() -> None:
+    """Disconnect every pooled connection (called on bot shutdown)."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.aclose()
@@ -17,10 +17,10 @@ scanning.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from datetime import datetime, timezone
 
+from bot import jsonutil
 from bot.config import bot_settings
 from bot.queue import JobQueue, ScanJob
 
@@ -39,39 +39,41 @@ async def _get_packages_due_for_rescan(
     db = await get_db()
     datetime.now(timezone.utc)
 
-    # Build SQL that selects the most recent scan per package and checks age
+    # Latest non-ERROR scan per package via an index seek per package
+    # (IX_public_scans_latest, api/migrations/008) instead of ranking and
+    # sorting the whole table with ROW_NUMBER().
     sql = """
-    WITH latest AS (
-        SELECT
-            ecosystem,
-            package_name,
-            package_version,
-            verdict,
-            metadata_json,
-            scanned_at,
-            ROW_NUMBER() OVER (
-                PARTITION BY ecosystem, package_name
-                ORDER BY scanned_at DESC
-            ) AS rn
+    SELECT TOP (?)
+        p.ecosystem,
+        p.package_name,
+        latest.package_version,
+        latest.verdict,
+        latest.metadata_json,
+        latest.scanned_at
+    FROM (
+        SELECT DISTINCT ecosystem, package_name
         FROM public_scans
         WHERE verdict != 'ERROR'
-    )
-    SELECT TOP (?)
-        ecosystem,
-        package_name,
-        package_version,
-        verdict,
-        metadata_json,
-        scanned_at
-    FROM latest
-    WHERE rn = 1
-    AND (
-        (verdict IN ('HIGH_RISK', 'CRITICAL_RISK') AND DATEDIFF(day, scanned_at, GETUTCDATE()) >= ?)
-        OR DATEDIFF(day, scanned_at, GETUTCDATE()) >= ?
+    ) AS p
+    CROSS APPLY (
+        SELECT TOP 1
+            s.package_version,
+            s.verdict,
+            s.metadata_json,
+            s.scanned_at
+        FROM public_scans AS s
+        WHERE s.ecosystem = p.ecosystem
+        AND s.package_name = p.package_name
+        AND s.verdict != 'ERROR'
+        ORDER BY s.scanned_at DESC
+    ) AS latest
+    WHERE (
+        (latest.verdict IN ('HIGH_RISK', 'CRITICAL_RISK') AND DATEDIFF(day, latest.scanned_at, GETUTCDATE()) >= ?)
+        OR DATEDIFF(day, latest.scanned_at, GETUTCDATE()) >= ?
     )
     ORDER BY
-        CASE WHEN verdict IN ('HIGH_RISK', 'CRITICAL_RISK') THEN 0 ELSE 1 END,
-        scanned_at ASC
+        CASE WHEN latest.verdict IN ('HIGH_RISK', 'CRITICAL_RISK') THEN 0 ELSE 1 END,
+        latest.scanned_at ASC
     """
 
     results = []
@@ -96,6 +98,43 @@ async def _get_packages_due_for_rescan(
     return results
 
 
+def _build_rescan_job(pkg: dict) -> ScanJob:
+    """Build a low-priority rescan job from a ``public_scans`` row."""
+    ecosystem = pkg["ecosystem"]
+    name = pkg["package_name"]
+    version = pkg.get("package_version", "")
+
+    # Parse metadata for download URL
+    meta = pkg.get("metadata_json", {})
+    if isinstance(meta, str):
+        try:
+            meta = jsonutil.loads(meta)
+        except jsonutil.JSONDecodeError:
+            meta = {}
+
+    # Build download URL based on ecosystem
+    download_url = meta.get("repository_url", "")
+    if not download_url:
+        if ecosystem == "github":
+            download_url = f"https://github.com/{name}.git"
+        elif ecosystem == "skills":
+            source = meta.get("source", name)
+            download_url = f"https://github.com/{source}.git"
+
+    return ScanJob(
+        ecosystem=ecosystem,
+        name=name,
+        version=version,
+        download_url=download_url,
+        priority="low",
+        metadata={
+            **meta,
+            "rescan": True,
+            "previous_verdict": pkg.get("verdict", ""),
+        },
+    )
+
+
 async def rescan_loop(queue: JobQueue) -> None:
     """Main rescan scheduling loop."""
     logger.info("Rescan scheduler starting (check interval=%ds)", RESCAN_CHECK_INTERVAL)
@@ -109,44 +148,8 @@ async def rescan_loop(queue: JobQueue) -> None:
                     "Rescan scheduler: %d packages due for rescan", len(packages)
                 )
 
-            enqueued = 0
-            for pkg in packages:
-                ecosystem = pkg["ecosystem"]
-                name = pkg["package_name"]
-                version = pkg.get("package_version", "")
-
-                # Parse metadata for download URL
-                meta = pkg.get("metadata_json", {})
-                if isinstance(meta, str):
-                    try:
-                        meta = json.loads(meta)
-                    except json.JSONDecodeError:
-                        meta = {}
-
-                # Build download URL based on ecosystem
-                download_url = meta.get("repository_url", "")
-                if not download_url:
-                    if ecosystem == "github":
-                        download_url = f"https://github.com/{name}.git"
-                    elif ecosystem == "skills":
-                        source = meta.get("source", name)
-                        download_url = f"https://github.com/{source}.git"
-
-                job = ScanJob(
-                    ecosystem=ecosystem,
-                    name=name,
-                    version=version,
-                    download_url=download_url,
-                    priority="low",
-                    metadata={
-                        **meta,
-                        "rescan": True,
-                        "previous_verdict": pkg.get("verdict", ""),
-                    },
-                )
-
-                if await queue.enqueue(job):
-                    enqueued += 1
+            jobs = [_build_rescan_job(pkg) for pkg in packages]
+            enqueued = await queue.enqueue_many(jobs)
 
             if enqueued:
                 logger.info("Rescan scheduler: enqueued %d rescan jobs", enqueued)
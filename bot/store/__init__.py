@@ -7,16 +7,27 @@ via Azure SQL Database using aioodbc.
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
+import itertools
 import logging
+import os
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import uuid4
 
+from bot import jsonutil
 from bot.config import bot_settings
 from bot.queue import ScanJob
 
+try:
+    import aioodbc
+    import pyodbc
+except ImportError:  # pragma: no cover - both are in bot/requirements.txt
+    aioodbc = pyodbc = None
+
 logger = logging.getLogger(__name__)
 
 # We use aioodbc to connect to Azure SQL Database with a dedicated connection
@@ -37,35 +48,35 @@ async def get_db():
     # Resolve the database URL — bot config first, then fall back to the
     # API-level env var (SIGIL_DATABASE_URL) which is also set on the
     # bot containers.
-    import os
-
     db_url = bot_settings.database_url or os.environ.get("SIGIL_DATABASE_URL")
 
     if db_url:
-        import aioodbc
+        if aioodbc is None:
+            raise RuntimeError("aioodbc/pyodbc are required for the bot store")
+
+        # Driver-manager pooling keeps physical connections alive across
+        # aioodbc pool churn (opt-in); must be set before the first connect.
+        pyodbc.pooling = bot_settings.db_odbc_pooling
 
         async def _configure_connection(raw_conn):
             """Register output converter for DATETIMEOFFSET (ODBC type -155)."""
-
-            def handle_datetimeoffset(dto_value):
-                tup = struct.unpack("<6hI2h", dto_value)
-                return datetime(
-                    tup[0],
-                    tup[1],
-                    tup[2],
-                    tup[3],
-                    tup[4],
-                    tup[5],
-                    tup[6] // 1000,
-                    timezone(timedelta(hours=tup[7], minutes=tup[8])),
-                )
-
-            raw_conn.add_output_converter(-155, handle_datetimeoffset)
+            raw_conn.add_output_converter(-155, _handle_datetimeoffset)
+            # Skip the "N rows affected" message after every statement — one
+            # less TDS token to read back per insert/update.
+            cursor = await raw_conn.execute("SET NOCOUNT ON")
+            await cursor.close()
 
         pool = await aioodbc.create_pool(
             dsn=db_url,
-            minsize=1,
-            maxsize=5,
+            minsize=bot_settings.db_pool_min_size,
+            maxsize=bot_settings.db_pool_max_size,
+            # One ODBC thread per pooled connection, separate from the loop's
+            # default executor (PyPI XML-RPC, DNS) so DB calls never queue
+            # behind unrelated blocking work.
+            executor=ThreadPoolExecutor(
+                max_workers=bot_settings.db_pool_max_size,
+                thread_name_prefix="sigil-odbc",
+            ),
             after_created=_configure_connection,
         )
         _db = _MssqlStore(pool)
@@ -75,11 +86,109 @@ async def get_db():
     raise RuntimeError("No database configured for bot store")
 
 
+_DATETIMEOFFSET = struct.Struct("<6hI2h")
+
+
+@functools.lru_cache(maxsize=128)
+def _tz(hours: int, minutes: int) -> timezone:
+    """Shared tzinfo per offset — nearly every row is UTC."""
+    return timezone(timedelta(hours=hours, minutes=minutes))
+
+
+def _handle_datetimeoffset(dto_value: bytes) -> datetime:
+    """Decode a raw SQL_SS_TIMESTAMPOFFSET struct into an aware datetime."""
+    year, month, day, hour, minute, second, ns, tz_h, tz_m = _DATETIMEOFFSET.unpack(
+        dto_value
+    )
+    return datetime(year, month, day, hour, minute, second, ns // 1000, _tz(tz_h, tz_m))
+
+
+async def close_db() -> None:
+    """Drain pending batched writes and close the connection pool."""
+    global _db
+    if _db is None:
+        return
+    db, _db = _db, None
+    await db.drain()
+    db._pool.close()
+    await db._pool.wait_closed()
+
+
+# SQL Server caps a statement at 2100 parameters and a VALUES constructor at
+# 1000 rows.
+_MAX_PARAMS = 2099
+_MERGE_MAX_ROWS = 1000
+
+
+def _to_json(value: Any) -> str:
+    """Serialise a dict/list column value for an NVARCHAR(MAX) column."""
+    return jsonutil.dumps(value).decode()
+
+
+def _params(data: dict[str, Any], cols: tuple[str, ...]) -> tuple[Any, ...]:
+    """Bind values for ``cols``, serialising dict/list values to JSON."""
+    return tuple(
+        _to_json(v) if isinstance(v, (dict, list)) else v
+        for v in (data[c] for c in cols)
+    )
+
+
 class _MssqlStore:
     """Minimal aioodbc wrapper for Azure SQL Database."""
 
     def __init__(self, pool):
         self._pool = pool
+        # Generated SQL keyed by (kind, table, columns, conflict columns) —
+        # the bot writes the same few row shapes over and over.
+        self._stmt_cache: dict[tuple, Any] = {}
+        # Group commit: upsert_batched() callers park here until the flusher
+        # has written and committed their row.
+        self._pending: asyncio.Queue[
+            tuple[str, dict[str, Any], tuple[str, ...], asyncio.Future]
+        ] = asyncio.Queue()
+        self._flush_task: asyncio.Task | None = None
+
+    def _insert_sql(self, table: str, cols: tuple[str, ...]) -> str:
+        key = ("insert", table, cols)
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            placeholders = ", ".join(["?"] * len(cols))
+            sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+            self._stmt_cache[key] = sql
+        return sql
+
+    def _update_plan(
+        self, table: str, cols: tuple[str, ...], conflict: tuple[str, ...]
+    ) -> tuple[str, tuple[int, ...]] | None:
+        """UPDATE statement for an upsert conflict plus the order in which to
+        bind ``values`` (SET columns, then WHERE columns), or None when every
+        column is a conflict column."""
+        key = ("update", table, cols, conflict)
+        if key not in self._stmt_cache:
+            update_cols = [c for c in cols if c not in conflict]
+            plan = None
+            if update_cols:
+                set_clause = ", ".join([f"{c} = ?" for c in update_cols])
+                where_clause = " AND ".join([f"{c} = ?" for c in conflict])
+                plan = (
+                    f"UPDATE {table} SET {set_clause} WHERE {where_clause}",
+                    tuple(cols.index(c) for c in (*update_cols, *conflict)),
+                )
+            self._stmt_cache[key] = plan
+        return self._stmt_cache[key]
+
+    def _select_top1_sql(
+        self, table: str, select_list: str, filter_cols: tuple[str, ...]
+    ) -> str:
+        key = ("select_top1", table, select_list, filter_cols)
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            where = " AND ".join(f"{c} = ?" for c in filter_cols)
+            sql = f"SELECT TOP 1 {select_list} FROM {table}" + (
+                f" WHERE {where}" if where else ""
+            )
+            self._stmt_cache[key] = sql
+        return sql
 
     @property
     def connected(self) -> bool:
@@ -93,19 +202,13 @@ class _MssqlStore:
         return dict(zip([col[0] for col in cursor.description], row))
 
     async def insert(self, table: str, data: dict[str, Any]) -> dict[str, Any]:
-        cols = list(data.keys())
-        placeholders = ", ".join(["?" for _ in cols])
+        cols = tuple(data.keys())
         # Serialise dict/list values to JSON strings for NVARCHAR(MAX) columns
-        values = []
-        for c in cols:
-            v = data[c]
-            if isinstance(v, (dict, list)):
-                v = json.dumps(v)
-            values.append(v)
-        sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+        values = _params(data, cols)
+        sql = self._insert_sql(table, cols)
         async with self._pool.acquire() as conn:
             cursor = await conn.cursor()
-            await cursor.execute(sql, tuple(values))
+            await cursor.execute(sql, values)
             await conn.commit()
 
             # For inserts, we need to find the inserted record since we can't use OUTPUT with triggers
@@ -121,25 +224,15 @@ class _MssqlStore:
     ) -> dict[str, Any]:
         # Optimistic INSERT, fall through to UPDATE on UNIQUE violation.
         # Race-safe under concurrent writers — SELECT-then-INSERT is not.
-        import pyodbc
-
-        cols = list(data.keys())
-        values: list[Any] = []
-        for c in cols:
-            v = data[c]
-            if isinstance(v, (dict, list)):
-                v = json.dumps(v)
-            values.append(v)
-        conflict = conflict_columns or ["id"]
-        update_cols = [c for c in cols if c not in conflict]
-
-        placeholders = ", ".join(["?" for _ in cols])
-        insert_sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+        cols = tuple(data.keys())
+        values = _params(data, cols)
+        conflict = tuple(conflict_columns or ["id"])
+        insert_sql = self._insert_sql(table, cols)
 
         async with self._pool.acquire() as conn:
             cursor = await conn.cursor()
             try:
-                await cursor.execute(insert_sql, tuple(values))
+                await cursor.execute(insert_sql, values)
                 await conn.commit()
                 return data
             except pyodbc.IntegrityError as e:
@@ -151,35 +244,184 @@ class _MssqlStore:
                     raise
                 await conn.rollback()
 
-            if not update_cols:
+            plan = self._update_plan(table, cols, conflict)
+            if plan is None:
                 # All columns are conflict columns; nothing to update.
                 return data
 
-            set_clause = ", ".join([f"{c} = ?" for c in update_cols])
-            where_clause = " AND ".join([f"{c} = ?" for c in conflict])
-            update_values = [values[cols.index(c)] for c in update_cols]
-            where_values = [values[cols.index(c)] for c in conflict]
-            update_sql = f"UPDATE {table} SET {set_clause} WHERE {where_clause}"
-            await cursor.execute(update_sql, tuple(update_values + where_values))
+            update_sql, order = plan
+            await cursor.execute(update_sql, tuple(values[i] for i in order))
             await conn.commit()
             return data
 
+    async def upsert_batched(
+        self,
+        table: str,
+        data: dict[str, Any],
+        conflict_columns: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Upsert via the background flusher, sharing one commit with
+        concurrent writers.
+
+        Waits until the row is committed (or raises its error), so callers
+        keep the durability and failure semantics of :meth:`upsert`; they
+        just trade up to ``db_flush_interval_ms`` of latency for fewer
+        commit round trips under load.
+        """
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(
+                self._flush_loop(), name="sigil-db-flusher"
+            )
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait((table, data, tuple(conflict_columns or ["id"]), fut))
+        await fut
+        return data
+
+    async def _flush_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = bot_settings.db_flush_interval_ms / 1000
+        max_batch = bot_settings.db_flush_max_batch
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + interval
+            while len(batch) < max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), remaining))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    async def _flush(
+        self,
+        batch: list[tuple[str, dict[str, Any], tuple[str, ...], asyncio.Future]],
+    ) -> None:
+        """Write one batch: a MERGE per row shape, falling back to per-row
+        upserts so one bad row cannot fail its neighbours."""
+        groups: dict[tuple, list[tuple[dict[str, Any], asyncio.Future]]] = {}
+        for table, data, conflict, fut in batch:
+            groups.setdefault((table, tuple(data), conflict), []).append((data, fut))
+
+        for (table, _, conflict), items in groups.items():
+            if len(items) > 1:
+                try:
+                    await self.bulk_upsert(
+                        table, [data for data, _ in items], list(conflict)
+                    )
+                except Exception:
+                    logger.warning(
+                        "Batched upsert of %d rows into %s failed; retrying per row",
+                        len(items),
+                        table,
+                        exc_info=True,
+                    )
+                else:
+                    for _, fut in items:
+                        if not fut.done():
+                            fut.set_result(None)
+                    continue
+
+            for data, fut in items:
+                try:
+                    await self.upsert(table, data, list(conflict))
+                except Exception as e:
+                    if not fut.done():
+                        fut.set_exception(e)
+                else:
+                    if not fut.done():
+                        fut.set_result(None)
+
+    async def drain(self) -> None:
+        """Flush queued batched writes and stop the flusher (shutdown)."""
+        if self._flush_task is None:
+            return
+        if not self._flush_task.done():
+            await self._pending.join()
+        self._flush_task.cancel()
+        await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._flush_task = None
+
+    async def bulk_upsert(
+        self,
+        table: str,
+        rows: list[dict[str, Any]],
+        conflict_columns: list[str] | None = None,
+    ) -> int:
+        """Upsert many rows with one multi-row MERGE per chunk.
+
+        All rows must share the same columns. Rows are sent in chunks that
+        stay under SQL Server's 2100-parameter limit, and the whole batch is
+        committed once. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        cols = tuple(rows[0].keys())
+        conflict = conflict_columns or ["id"]
+        update_cols = [c for c in cols if c not in conflict]
+
+        # MERGE refuses to touch one target row twice — last write wins
+        # for duplicate keys inside the batch.
+        latest = {tuple(row[c] for c in conflict): row for row in rows}
+        values = [_params(row, cols) for row in latest.values()]
+
+        col_list = ", ".join(cols)
+        row_placeholders = f"({', '.join(['?'] * len(cols))})"
+        on_clause = " AND ".join(f"target.{c} = source.{c}" for c in conflict)
+        matched_clause = (
+            "WHEN MATCHED THEN UPDATE SET "
+            + ", ".join(f"{c} = source.{c}" for c in update_cols)
+            + " "
+            if update_cols
+            else ""
+        )
+        insert_values = ", ".join(f"source.{c}" for c in cols)
+        merge_action = (
+            f"ON {on_clause} {matched_clause}"
+            f"WHEN NOT MATCHED THEN INSERT ({col_list}) "
+            f"VALUES ({insert_values});"
+        )
+
+        rows_per_chunk = max(1, min(_MERGE_MAX_ROWS, _MAX_PARAMS // len(cols)))
+        async with self._pool.acquire() as conn:
+            cursor = await conn.cursor()
+            try:
+                for start in range(0, len(values), rows_per_chunk):
+                    chunk = values[start : start + rows_per_chunk]
+                    sql = (
+                        f"MERGE {table} WITH (HOLDLOCK) AS target "
+                        f"USING (VALUES {', '.join([row_placeholders] * len(chunk))}) "
+                        f"AS source ({col_list}) {merge_action}"
+                    )
+                    await cursor.execute(
+                        sql, list(itertools.chain.from_iterable(chunk))
+                    )
+                await conn.commit()
+            except Exception:
+                # Don't hand earlier chunks back to the pool uncommitted
+                await conn.rollback()
+                raise
+        return len(values)
+
     async def select_one(
-        self, table: str, filters: dict[str, Any]
+        self,
+        table: str,
+        filters: dict[str, Any],
     ) -> dict[str, Any] | None:
-        conditions, vals = [], []
-        for k, v in filters.items():
-            conditions.append(f"{k} = ?")
-            vals.append(v)
-        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-        sql = f"SELECT TOP 1 * FROM {table} {where}"
+        sql = self._select_top1_sql(table, "*", tuple(filters))
         async with self._pool.acquire() as conn:
             cursor = await conn.cursor()
-            await cursor.execute(sql, tuple(vals))
+            await cursor.execute(sql, tuple(filters.values()))
             row = await cursor.fetchone()
             return self._row_to_dict(cursor, row)
 
 
+@functools.lru_cache(maxsize=8192)
 def _build_registry_url(ecosystem: str, name: str, version: str) -> str:
     """Build a direct link to the package on its registry."""
     if ecosystem == "npm":
@@ -202,6 +444,10 @@ def _build_registry_url(ecosystem: str, name: str, version: str) -> str:
     return ""
 
 
+# Ecosystem-specific download counters, in order of preference
+_DOWNLOAD_COUNT_KEYS = ("downloads", "weekly_downloads", "installs")
+
+
 def _enrich_metadata(
     job: ScanJob,
     files_scanned: int,
@@ -214,14 +460,16 @@ def _enrich_metadata(
     (keywords, registry_url, published_at, download_count, repository_url)
     when available from the watcher.
     """
-    meta = dict(job.metadata)
-
-    # Required AEO fields (always present)
-    meta["source"] = meta.get("source", "sigil-bot")
-    meta["bot_scan"] = True
-    meta["files_scanned"] = files_scanned
-    meta["scanner_version"] = "2.0.0"  # Updated to Scanner v2 for bot operations
-    meta["duration_ms"] = duration_ms
+    # Required AEO fields (always present); watcher metadata may override
+    # the source but never the scan facts.
+    meta = {
+        "source": "sigil-bot",
+        **job.metadata,
+        "bot_scan": True,
+        "files_scanned": files_scanned,
+        "scanner_version": "2.0.0",  # Updated to Scanner v2 for bot operations
+        "duration_ms": duration_ms,
+    }
 
     # Truncate description to 200 chars per spec
     desc = meta.get("description", "")
@@ -245,10 +493,9 @@ def _enrich_metadata(
 
     # Normalize download_count from ecosystem-specific field names
     if "download_count" not in meta:
-        for key in ("downloads", "weekly_downloads", "installs"):
-            if key in meta:
-                meta["download_count"] = meta[key]
-                break
+        key = next((k for k in _DOWNLOAD_COUNT_KEYS if k in meta), None)
+        if key is not None:
+            meta["download_count"] = meta[key]
 
     # Provenance: where the package was actually downloaded/cloned from
     if job.download_url and "scanned_from" not in meta:
@@ -277,7 +524,10 @@ async def store_scan_result(
     """
     db = await get_db()
     now = datetime.now(timezone.utc)
-    scan_id = str(uuid4())
+    # Bound as a native GUID (16 bytes on the wire); callers get the
+    # canonical dashed form used in feed/badge links.
+    scan_uuid = uuid4()
+    scan_id = str(scan_uuid)
 
     findings = scan_output.get("findings", [])
     score = scan_output.get("score", 0.0)
@@ -310,7 +560,7 @@ async def store_scan_result(
         confidence_level = None
 
     row = {
-        "id": scan_id,
+        "id": scan_uuid,
         "ecosystem": job.ecosystem,
         "package_name": job.name,
         "package_version": job.version,
@@ -373,7 +623,7 @@ async def store_scan_result(
         row["log_entry_id"] = log_entry_id
 
     try:
-        await db.upsert(
+        await db.upsert_batched(
             "public_scans",
             row,
             conflict_columns=["ecosystem", "package_name", "package_version"],
@@ -412,7 +662,7 @@ async def store_scan_error(
     now = datetime.now(timezone.utc)
 
     row = {
-        "id": str(uuid4()),
+        "id": uuid4(),
         "ecosystem": job.ecosystem,
         "package_name": job.name,
         "package_version": job.version,
@@ -460,8 +710,8 @@ async def has_been_scanned(
             # Handle JSON string from database
             if isinstance(metadata, str):
                 try:
-                    metadata = json.loads(metadata)
-                except json.JSONDecodeError:
+                    metadata = jsonutil.loads(metadata)
+                except jsonutil.JSONDecodeError:
                     return False
             stored_hash = metadata.get("content_hash", "")
             return stored_hash == content_hash
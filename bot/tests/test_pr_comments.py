@@ -0,0 +1,215 @@
+"""
+Sigil Bot — PR Comment Worker Tests
+
+Tests event claiming, the wake-up/debounce wait and the shared scan lookups
+of the PR comment worker, using fake database and Redis clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from bot.worker import pr_comments
+from bot.worker.pr_comments import (
+    PR_EVENT_DEBOUNCE_SECONDS,
+    PR_EVENT_DEBOUNCE_SLACK_SECONDS,
+    PR_EVENTS_WAKEUP_KEY,
+)
+
+
+class _FakeDb:
+    """Records the calls the worker makes against api.database.db."""
+
+    def __init__(self, connected: bool = True) -> None:
+        self.connected = connected
+        self.executed: list[tuple[str, dict[str, Any]]] = []
+        self.updated: list[tuple[dict[str, Any], dict[str, Any]]] = []
+        self.rows: list[dict[str, Any]] = []
+
+    async def execute(self, sql: str, values: dict[str, Any]) -> list[dict[str, Any]]:
+        self.executed.append((sql, values))
+        return self.rows
+
+    async def select(self, table: str, **kwargs: Any) -> list[dict[str, Any]]:
+        return self.rows[: kwargs.get("limit")]
+
+    async def update(
+        self, table: str, filters: dict[str, Any], data: dict[str, Any]
+    ) -> None:
+        self.updated.append((filters, data))
+
+
+class _FakeCache:
+    """Stands in for api.database.cache; ``popped`` is what brpop returns."""
+
+    def __init__(self, popped: Any = None, connected: bool = True) -> None:
+        self.connected = connected
+        self.popped = popped
+        self.pop_delay = 0.0
+        self.deleted: list[str] = []
+
+    async def brpop(self, key: str, timeout: int = 0) -> Any:
+        if self.pop_delay:
+            await _real_sleep(self.pop_delay)
+        return self.popped
+
+    async def delete(self, key: str) -> None:
+        self.deleted.append(key)
+
+
+_real_sleep = asyncio.sleep
+
+
+@pytest.fixture
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record asyncio.sleep() calls instead of waiting."""
+    calls: list[float] = []
+
+    async def _sleep(delay: float, result: Any = None) -> Any:
+        calls.append(delay)
+        return result
+
+    monkeypatch.setattr(asyncio, "sleep", _sleep)
+    return calls
+
+
+class TestClaimEvents:
+    """_claim_events() hands each pending event to exactly one worker."""
+
+    @pytest.mark.asyncio
+    async def test_claims_through_sql_with_debounce(self) -> None:
+        db = _FakeDb()
+        db.rows = [{"id": "pr-o/r-1"}]
+        assert await pr_comments._claim_events(db, 5) == [{"id": "pr-o/r-1"}]
+
+        (sql, values), = db.executed
+        assert values == {"batch_size": 5, "debounce": PR_EVENT_DEBOUNCE_SECONDS}
+        assert "READPAST" in sql
+        assert "DATEADD(SECOND, -:debounce, SYSDATETIMEOFFSET())" in sql
+
+    @pytest.mark.asyncio
+    async def test_memory_mode_marks_events_processing(self) -> None:
+        db = _FakeDb(connected=False)
+        db.rows = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        assert await pr_comments._claim_events(db, 2) == [{"id": "a"}, {"id": "b"}]
+        assert db.executed == []
+        assert db.updated == [
+            ({"id": "a"}, {"status": "processing"}),
+            ({"id": "b"}, {"status": "processing"}),
+        ]
+
+
+class TestWaitForEvents:
+    """_wait_for_events() blocks on the webhook's wake-up signal."""
+
+    @pytest.mark.asyncio
+    async def test_signal_waits_out_the_debounce_window(self, sleeps) -> None:
+        cache = _FakeCache(popped=("key", "pr-o/r-1"))
+        assert await pr_comments._wait_for_events(cache, 30, 300)
+        assert cache.deleted == [PR_EVENTS_WAKEUP_KEY]
+        assert sleeps == [PR_EVENT_DEBOUNCE_SECONDS + PR_EVENT_DEBOUNCE_SLACK_SECONDS]
+
+    @pytest.mark.asyncio
+    async def test_failed_pop_backs_off(self, sleeps) -> None:
+        """RedisClient.brpop returns None at once when Redis is down."""
+        cache = _FakeCache(popped=None)
+        assert not await pr_comments._wait_for_events(cache, 30, 300)
+        assert cache.deleted == []
+        assert sleeps == [30]
+
+    @pytest.mark.asyncio
+    async def test_pop_timeout_polls_straight_away(self, sleeps) -> None:
+        cache = _FakeCache(popped=None)
+        cache.pop_delay = 0.05
+        assert not await pr_comments._wait_for_events(cache, 30, 0.05)
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_without_redis_polls(self, sleeps) -> None:
+        cache = _FakeCache(popped=("key", "pr-o/r-1"), connected=False)
+        assert not await pr_comments._wait_for_events(cache, 30, 300)
+        assert sleeps == [30]
+
+
+class _LookupDb:
+    """Serves public_scans rows for _lookup_scans, optionally blocking."""
+
+    connected = True
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.queries: list[tuple[Any, ...]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def execute_raw_sql(self, sql: str, params: tuple[Any, ...]):
+        self.queries.append(params)
+        await self.release.wait()
+        return self.rows
+
+
+def _dep(ecosystem: str, name: str) -> dict[str, str]:
+    return {"ecosystem": ecosystem, "name": name}
+
+
+class TestLookupScans:
+    """_lookup_scans() shares lookups between the events of one batch."""
+
+    @pytest.mark.asyncio
+    async def test_memo_skips_known_packages(self) -> None:
+        row = {"ecosystem": "npm", "package_name": "evil", "verdict": "HIGH_RISK"}
+        db = _LookupDb([row])
+        memo: pr_comments.ScanMemo = {}
+
+        first = await pr_comments._lookup_scans(db, [_dep("npm", "evil")], memo)
+        second = await pr_comments._lookup_scans(
+            db, [_dep("npm", "evil"), _dep("npm", "left-pad")], memo
+        )
+
+        assert first == {("npm", "evil"): row}
+        assert second == {("npm", "evil"): row}
+        assert db.queries == [("npm", "evil"), ("npm", "left-pad")]
+
+    @pytest.mark.asyncio
+    async def test_waits_on_a_lookup_in_flight(self) -> None:
+        row = {"ecosystem": "npm", "package_name": "evil", "verdict": "HIGH_RISK"}
+        db = _LookupDb([row])
+        db.release.clear()
+        memo: pr_comments.ScanMemo = {}
+
+        owner = asyncio.create_task(
+            pr_comments._lookup_scans(db, [_dep("npm", "evil")], memo)
+        )
+        await _real_sleep(0)
+        waiter = asyncio.create_task(
+            pr_comments._lookup_scans(db, [_dep("npm", "evil")], memo)
+        )
+        await _real_sleep(0)
+        db.release.set()
+
+        assert await owner == await waiter == {("npm", "evil"): row}
+        assert len(db.queries) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_lookup_releases_waiters(self) -> None:
+        db = _LookupDb([])
+        db.release.clear()
+        memo: pr_comments.ScanMemo = {}
+
+        owner = asyncio.create_task(
+            pr_comments._lookup_scans(db, [_dep("npm", "evil")], memo)
+        )
+        await _real_sleep(0)
+        waiter = asyncio.create_task(
+            pr_comments._lookup_scans(db, [_dep("npm", "evil")], memo)
+        )
+        await _real_sleep(0)
+        owner.cancel()
+
+        assert await asyncio.wait_for(waiter, 1) == {}
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        assert memo[("npm", "evil")].result() is None
@@ -0,0 +1,179 @@
+"""
+Sigil Bot — Store Tests
+
+Tests the bot's Azure SQL store helpers against in-process fakes, so no
+database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from bot import store
+from bot.config import bot_settings
+
+
+class _FakeDb:
+    """Stands in for _MssqlStore: serves one row from select_one."""
+
+    def __init__(self, row: dict[str, Any] | None) -> None:
+        self.row = row
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def select_one(self, table: str, filters: dict[str, Any]):
+        self.calls.append((table, filters))
+        return self.row
+
+
+class TestHasBeenScanned:
+    """has_been_scanned() decides whether the watcher re-queues a package."""
+
+    @pytest.fixture
+    def use_row(self, monkeypatch: pytest.MonkeyPatch):
+        def _use(row: dict[str, Any] | None) -> _FakeDb:
+            fake = _FakeDb(row)
+            monkeypatch.setattr(store, "_db", fake)
+            return fake
+
+        return _use
+
+    @pytest.mark.asyncio
+    async def test_no_row_is_not_scanned(self, use_row) -> None:
+        fake = use_row(None)
+        assert not await store.has_been_scanned("npm", "left-pad", "1.0.0")
+        assert fake.calls == [
+            (
+                "public_scans",
+                {
+                    "ecosystem": "npm",
+                    "package_name": "left-pad",
+                    "package_version": "1.0.0",
+                },
+            )
+        ]
+
+    @pytest.mark.asyncio
+    async def test_blank_version_matches_any_version(self, use_row) -> None:
+        fake = use_row({"metadata_json": None})
+        assert await store.has_been_scanned("npm", "left-pad", "")
+        assert fake.calls[0][1] == {"ecosystem": "npm", "package_name": "left-pad"}
+
+    @pytest.mark.asyncio
+    async def test_matching_content_hash(self, use_row) -> None:
+        use_row({"metadata_json": '{"content_hash": "abc"}'})
+        assert await store.has_been_scanned("npm", "left-pad", "1.0.0", "abc")
+        assert not await store.has_been_scanned("npm", "left-pad", "1.0.0", "def")
+
+    @pytest.mark.asyncio
+    async def test_null_metadata_counts_as_scanned(self, use_row) -> None:
+        """Rows written before content hashes were recorded are not rescanned."""
+        use_row({"metadata_json": None})
+        assert await store.has_been_scanned("npm", "left-pad", "1.0.0", "abc")
+
+    @pytest.mark.asyncio
+    async def test_unparseable_metadata_is_not_scanned(self, use_row) -> None:
+        use_row({"metadata_json": "{not json"})
+        assert not await store.has_been_scanned("npm", "left-pad", "1.0.0", "abc")
+
+
+class _RecordingStore(store._MssqlStore):
+    """_MssqlStore whose writes are recorded instead of sent to a pool."""
+
+    def __init__(self) -> None:
+        super().__init__(pool=None)
+        self.bulk: list[list[dict[str, Any]]] = []
+        self.single: list[dict[str, Any]] = []
+        self.fail_bulk = False
+        self.fail_ids: set[str] = set()
+
+    async def bulk_upsert(self, table, rows, conflict_columns=None) -> int:
+        if self.fail_bulk:
+            raise RuntimeError("MERGE failed")
+        self.bulk.append(rows)
+        return len(rows)
+
+    async def upsert(self, table, data, conflict_columns=None):
+        if data["id"] in self.fail_ids:
+            raise RuntimeError(f"bad row {data['id']}")
+        self.single.append(data)
+        return data
+
+
+class TestUpsertBatched:
+    """upsert_batched() group-commits concurrent writes via the flusher."""
+
+    @pytest.fixture
+    def flush_settings(self, monkeypatch: pytest.MonkeyPatch):
+        def _set(interval_ms: int, max_batch: int) -> None:
+            monkeypatch.setattr(bot_settings, "db_flush_interval_ms", interval_ms)
+            monkeypatch.setattr(bot_settings, "db_flush_max_batch", max_batch)
+
+        return _set
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self, flush_settings) -> None:
+        flush_settings(interval_ms=60_000, max_batch=3)
+        db = _RecordingStore()
+        rows = [{"id": str(i), "v": i} for i in range(3)]
+
+        await asyncio.wait_for(
+            asyncio.gather(*(db.upsert_batched("t", row) for row in rows)), 1
+        )
+
+        assert db.bulk == [rows]
+        await db.drain()
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_interval(self, flush_settings) -> None:
+        flush_settings(interval_ms=20, max_batch=100)
+        db = _RecordingStore()
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                db.upsert_batched("t", {"id": "a", "v": 1}),
+                db.upsert_batched("t", {"id": "b", "v": 2}),
+            ),
+            1,
+        )
+        await asyncio.wait_for(db.upsert_batched("t", {"id": "c", "v": 3}), 1)
+
+        assert db.bulk == [[{"id": "a", "v": 1}, {"id": "b", "v": 2}]]
+        assert db.single == [{"id": "c", "v": 3}]
+        await db.drain()
+
+    @pytest.mark.asyncio
+    async def test_drain_flushes_queued_writes(self, flush_settings) -> None:
+        flush_settings(interval_ms=20, max_batch=100)
+        db = _RecordingStore()
+        writes = [
+            asyncio.create_task(db.upsert_batched("t", {"id": str(i), "v": i}))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0)
+
+        await asyncio.wait_for(db.drain(), 1)
+
+        assert all(w.done() and w.exception() is None for w in writes)
+        assert db.bulk == [[{"id": "0", "v": 0}, {"id": "1", "v": 1}]]
+        assert db._flush_task is None
+
+    @pytest.mark.asyncio
+    async def test_failed_merge_isolates_bad_rows(self, flush_settings) -> None:
+        flush_settings(interval_ms=20, max_batch=2)
+        db = _RecordingStore()
+        db.fail_bulk = True
+        db.fail_ids = {"bad"}
+
+        good, bad = await asyncio.gather(
+            db.upsert_batched("t", {"id": "ok", "v": 1}),
+            db.upsert_batched("t", {"id": "bad", "v": 2}),
+            return_exceptions=True,
+        )
+
+        assert good == {"id": "ok", "v": 1}
+        assert isinstance(bad, RuntimeError)
+        assert db.single == [{"id": "ok", "v": 1}]
+        await db.drain()
@@ -1,7 +1,7 @@
 """
 Sigil Bot — Watcher Base Class
 
-Abstract base for registry watchers. Each watcher polls a single registry
+Base class for registry watchers. Each watcher polls a single registry
 feed, deduplicates, applies scope filters, and enqueues scan jobs.
 """
 
@@ -9,15 +9,84 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from abc import ABC, abstractmethod
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
 
+import httpx
+
+from bot import jsonutil
 from bot.queue import JobQueue, ScanJob
 
 logger = logging.getLogger(__name__)
 
+# Per-watcher cap on in-flight metadata lookups against one registry
+META_FETCH_CONCURRENCY = 10
+
+# Registry metadata cache: every lookup is revalidated with
+# If-None-Match/-Modified-Since, so a 304 reuses the cached parse.
+META_CACHE_MAX = 5000
+
+
+class RateLimiter:
+    """Paces requests to one API from its responses.
+
+    Request starts are spaced at least ``min_interval`` apart and stretched
+    to spread the remaining ``X-RateLimit-*`` budget over the time left until
+    reset. A throttled response (429, or 403 with an exhausted budget or a
+    ``Retry-After``) pushes the next start out by ``Retry-After``, the reset
+    time, or an exponential backoff.
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_backoff: float = 60.0) -> None:
+        self.min_interval = min_interval
+        self.max_backoff = max_backoff
+        self._next_at = 0.0
+        self._throttled = 0
+
+    async def acquire(self) -> None:
+        """Wait until the next request may start."""
+        while (delay := self._next_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        self._next_at = time.monotonic() + self.min_interval
 
-class BaseWatcher(ABC):
-    """Abstract base class for registry watchers.
+    def observe(self, resp: httpx.Response) -> bool:
+        """Update pacing from ``resp``; True if it was throttled (retry later)."""
+        headers = resp.headers
+        now = time.monotonic()
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        reset_in = _header_int(headers, "X-RateLimit-Reset")
+        if reset_in is not None:
+            reset_in = max(0, reset_in - int(time.time()))
+
+        retry_after = _header_int(headers, "Retry-After")
+        if resp.status_code == 429 or (
+            resp.status_code == 403 and (remaining == 0 or retry_after is not None)
+        ):
+            self._throttled += 1
+            if retry_after is not None:
+                wait = retry_after
+            elif remaining == 0 and reset_in is not None:
+                wait = reset_in
+            else:
+                wait = min(self.max_backoff, 2.0**self._throttled)
+            self._next_at = max(self._next_at, now + wait)
+            return True
+
+        self._throttled = 0
+        if remaining is not None and reset_in is not None:
+            self._next_at = max(self._next_at, now + reset_in / max(remaining, 1))
+        return False
+
+
+def _header_int(headers: httpx.Headers, name: str) -> int | None:
+    value = headers.get(name, "")
+    return int(value) if value.isdigit() else None
+
+
+class BaseWatcher:
+    """Base class for registry watchers.
 
     Subclasses implement:
       - name: unique watcher identifier (used for checkpointing)
@@ -25,37 +94,150 @@ class BaseWatcher(ABC):
       - poll(): fetch new packages from the registry, return ScanJobs
     """
 
+    # Per-request timeout for the shared HTTP client (seconds)
+    http_timeout: float = 30.0
+    # Minimum spacing between paced requests (see RateLimiter)
+    min_request_interval: float = 0.0
+
     def __init__(self, queue: JobQueue) -> None:
         self.queue = queue
         self._running = False
+        self._client: httpx.AsyncClient | None = None
+        self._meta_sem = asyncio.Semaphore(META_FETCH_CONCURRENCY)
+        self.rate_limiter = RateLimiter(self.min_request_interval)
+        # Last checkpoint value known to be in Redis (loaded or saved)
+        self._saved_checkpoint: str | None = None
+        # url -> (etag, last_modified, parsed body, cached_at), LRU order
+        self._meta_cache: OrderedDict[str, tuple[str, str, Any]] = OrderedDict()
+
+    def _default_headers(self) -> dict[str, str]:
+        """Headers sent with every registry request (override per watcher)."""
+        return {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Long-lived HTTP/2 client shared by every poll of this watcher.
+
+        httpx advertises ``br, gzip, deflate`` in Accept-Encoding itself (``br``
+        via the brotli extra) and decodes responses transparently.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.http_timeout),
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+                http2=True,
+                headers=self._default_headers(),
+            )
+        return self._client
+
+    async def _fetch_all(
+        self,
+        fetch: Callable[[httpx.AsyncClient, str], Awaitable[dict[str, Any]]],
+        names: Iterable[str],
+    ) -> dict[str, dict[str, Any]]:
+        """Run ``fetch(client, name)`` for each distinct name concurrently,
+        at most META_FETCH_CONCURRENCY at a time.
+
+        A failed lookup maps to ``{}`` instead of failing the whole batch.
+        """
+        unique = list(dict.fromkeys(names))
+
+        async def guarded(name: str) -> dict[str, Any]:
+            async with self._meta_sem:
+                return await fetch(self.client, name)
+
+        results = await asyncio.gather(
+            *(guarded(n) for n in unique), return_exceptions=True
+        )
+        metas: dict[str, dict[str, Any]] = {}
+        for name, result in zip(unique, results):
+            if isinstance(result, BaseException):
+                logger.debug("Watcher [%s] lookup failed for %s", self.name, name)
+                result = {}
+            metas[name] = result
+        return metas
+
+    async def _get_json_cached(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str] | None = None,
+        extract: Callable[[Any], Any] | None = None,
+    ) -> Any:
+        """GET a JSON document through the watcher's metadata cache.
+
+        Cached entries are always revalidated (lookups follow a change-feed
+        entry, so the document may have just changed) and a
+        ``304 Not Modified`` reuses the cached parse. ``extract`` trims the
+        body before caching. Returns ``{}`` on a non-200 response.
+        """
+        entry = self._meta_cache.get(url)
+        if entry is not None:
+            etag, last_modified, cached = entry
+            headers = dict(headers or {})
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        resp = await client.get(url, headers=headers)
+        if resp.status_code == 304 and entry is not None:
+            data = cached
+            etag_out, modified_out = etag, last_modified
+        elif resp.status_code == 200:
+            data = jsonutil.loads(resp.content)
+            if extract is not None:
+                data = extract(data)
+            etag_out = resp.headers.get("etag", "")
+            modified_out = resp.headers.get("last-modified", "")
+        else:
+            return {}
+
+        self._meta_cache[url] = (etag_out, modified_out, data)
+        self._meta_cache.move_to_end(url)
+        if len(self._meta_cache) > META_CACHE_MAX:
+            self._meta_cache.popitem(last=False)
+        return data
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on bot shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @property
-    @abstractmethod
     def name(self) -> str:
         """Unique watcher name used for checkpoint keys."""
-        ...
+        raise NotImplementedError
 
     @property
-    @abstractmethod
     def poll_interval_seconds(self) -> int:
         """Seconds between poll cycles."""
-        ...
+        raise NotImplementedError
 
-    @abstractmethod
     async def poll(self) -> list[ScanJob]:
         """Poll the registry and return new scan jobs to enqueue.
 
         Must handle its own checkpointing (load/save via self.queue).
         """
-        ...
+        raise NotImplementedError
 
     async def load_checkpoint(self) -> str | None:
         """Load last checkpoint from Redis."""
-        return await self.queue.load_checkpoint(self.name)
+        value = await self.queue.load_checkpoint(self.name)
+        self._saved_checkpoint = value
+        return value
 
     async def save_checkpoint(self, value: str) -> None:
-        """Persist checkpoint to Redis."""
+        """Persist checkpoint to Redis, skipping the write if it hasn't moved."""
+        if value == self._saved_checkpoint:
+            return
         await self.queue.save_checkpoint(self.name, value)
+        self._saved_checkpoint = value
 
     async def run(self) -> None:
         """Main polling loop. Runs until stopped."""
@@ -69,10 +251,8 @@ class BaseWatcher(ABC):
         while self._running:
             try:
                 jobs = await self.poll()
-                enqueued = 0
-                for job in jobs:
-                    if await self.queue.enqueue(job):
-                        enqueued += 1
+                # One pipelined round trip for the whole poll
+                enqueued = await self.queue.enqueue_many(jobs)
 
                 if jobs:
                     logger.info(
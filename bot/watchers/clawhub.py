@@ -10,24 +10,32 @@ Scope: ALL skills (no keyword filtering needed).
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from datetime import datetime, timezone
+from typing import Any
 
+import httpx
+
+from bot import jsonutil
 from bot.config import bot_settings
 from bot.filters import determine_priority
-from bot.queue import JobQueue, ScanJob
+from bot.queue import ScanJob
 from bot.watchers.base import BaseWatcher
 
 logger = logging.getLogger(__name__)
 
 CLAWHUB_BASE = "https://clawhub.ai/api/v1"
 
+CLAWHUB_SKILLS_URL = f"{CLAWHUB_BASE}/skills"
+_PAGE_PARAMS = {"limit": 20, "sort": "updated"}
+
 
 class ClawHubWatcher(BaseWatcher):
     """Monitors ClawHub registry for new/updated skills."""
 
-    def __init__(self, queue: JobQueue) -> None:
-        super().__init__(queue)
-        self._seen_slugs: dict[str, str] = {}  # slug -> updated_at
+    # Rate limit: ~120 req/min → one request start every 0.5s at most
+    min_request_interval = 0.5
 
     @property
     def name(self) -> str:
@@ -39,93 +47,139 @@ class ClawHubWatcher(BaseWatcher):
 
     async def poll(self) -> list[ScanJob]:
         """Paginate ClawHub with sort=updated to find new/changed skills."""
-        import httpx
-
         jobs: list[ScanJob] = []
-        cursor: str | None = None
         checkpoint = await self.load_checkpoint()
         last_updated = str(checkpoint) if checkpoint else ""
+        last_ts = _updated_ts(last_updated)
         newest_updated = last_updated
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            pages = 0
-            while pages < 300:  # Safety limit (~6000 skills at 20/page)
-                params: dict = {"limit": 20, "sort": "updated"}
-                if cursor:
-                    params["cursor"] = cursor
-
-                try:
-                    resp = await client.get(f"{CLAWHUB_BASE}/skills", params=params)
-                    resp.raise_for_status()
-                    data = resp.json()
-                except Exception:
-                    logger.exception("ClawHub API error on page %d", pages)
+        newest_ts = last_ts
+        caught_up = False
+
+        async def fetch_page(client: httpx.AsyncClient, cursor: str | None) -> dict:
+            params = {**_PAGE_PARAMS, "cursor": cursor} if cursor else _PAGE_PARAMS
+            for _ in range(3):
+                # Paces request *starts*, so parsing the previous page
+                # overlaps the wait without exceeding the quota.
+                await self.rate_limiter.acquire()
+                resp = await client.get(CLAWHUB_SKILLS_URL, params=params)
+                if not self.rate_limiter.observe(resp):
                     break
-
-                items = data.get("items", data.get("skills", []))
-                if not items:
-                    break
-
-                for item in items:
-                    slug = item.get("slug", item.get("name", ""))
-                    updated = item.get("updatedAt", item.get("updated_at", ""))
-                    raw_version = item.get("version", item.get("latestVersion", ""))
-                    # The API may return version as a dict
-                    # (e.g. {"version": "1.0.0", "createdAt": ...})
-                    if isinstance(raw_version, dict):
-                        version = raw_version.get("version", "")
-                    else:
-                        version = str(raw_version) if raw_version else ""
-
-                    if not slug:
-                        continue
-
-                    # Normalise to string for comparison (API may
-                    # return int epoch or ISO string)
-                    updated = str(updated) if updated else ""
-
-                    # Skip if we've already seen this version
-                    if updated and updated <= last_updated:
-                        # Once we hit skills older than checkpoint, stop
-                        await self.save_checkpoint(newest_updated or updated)
-                        return jobs
-
-                    if updated and updated > newest_updated:
-                        newest_updated = updated
-
-                    download_url = f"{CLAWHUB_BASE}/download?slug={slug}" + (
-                        f"&version={version}" if version else ""
-                    )
-
-                    job = ScanJob(
-                        ecosystem="clawhub",
-                        name=slug,
-                        version=version,
-                        download_url=download_url,
-                        priority=determine_priority("clawhub", slug),
-                        metadata={
-                            "author": item.get("author", item.get("owner", "")),
-                            "description": item.get("description", ""),
-                            "stars": item.get("stars", item.get("starCount", 0)),
-                            "downloads": item.get(
-                                "downloads", item.get("downloadCount", 0)
-                            ),
-                            "updated_at": updated,
-                        },
-                    )
-                    jobs.append(job)
-
-                cursor = data.get("nextCursor", data.get("cursor"))
-                if not cursor:
-                    break
-                pages += 1
-
-                # Rate limit: ~120 req/min → ~0.5s between
-                import asyncio
-
-                await asyncio.sleep(0.5)
-
-        if newest_updated:
+            resp.raise_for_status()
+            return jsonutil.loads(resp.content)
+
+        client = self.client
+        pages = 0
+        pending = asyncio.create_task(fetch_page(client, None))
+        while not caught_up and pages < 300:  # Safety limit (~6000 at 20/page)
+            try:
+                data = await pending
+            except Exception:
+                logger.exception("ClawHub API error on page %d", pages)
+                break
+
+            items = _coalesce(data, "items", "skills", [])
+            if not items:
+                break
+
+            # Prefetch the next page while this one is being processed
+            cursor = _coalesce(data, "nextCursor", "cursor", None)
+            pending = (
+                asyncio.create_task(fetch_page(client, cursor))
+                if cursor and pages + 1 < 300
+                else None
+            )
+
+            for item in items:
+                # Results are sorted by updated desc: check the timestamp
+                # before touching any other field so a caught-up poll
+                # exits on the first row.
+                updated = _coalesce(item, "updatedAt", "updated_at", "")
+                # Normalise to string for the checkpoint (API may return
+                # int epoch or ISO string); compare numerically.
+                updated = str(updated) if updated else ""
+                updated_ts = _updated_ts(updated)
+
+                # Once we hit skills older than checkpoint, stop
+                if last_ts is not None and updated_ts is not None:
+                    caught_up = updated_ts <= last_ts
+                    if caught_up:
+                        break
+
+                if updated_ts is not None and (
+                    newest_ts is None or updated_ts > newest_ts
+                ):
+                    newest_updated = updated
+                    newest_ts = updated_ts
+
+                slug = _coalesce(item, "slug", "name", "")
+                if not slug:
+                    continue
+
+                raw_version = _coalesce(item, "version", "latestVersion", "")
+                # The API may return version as a dict
+                # (e.g. {"version": "1.0.0", "createdAt": ...})
+                if isinstance(raw_version, dict):
+                    version = raw_version.get("version", "")
+                else:
+                    version = str(raw_version) if raw_version else ""
+
+                download_url = f"{CLAWHUB_BASE}/download?slug={slug}" + (
+                    f"&version={version}" if version else ""
+                )
+
+                job = ScanJob(
+                    ecosystem="clawhub",
+                    name=slug,
+                    version=version,
+                    download_url=download_url,
+                    priority=determine_priority("clawhub", slug),
+                    metadata={
+                        "author": _coalesce(item, "author", "owner", ""),
+                        "description": item.get("description", ""),
+                        "stars": _coalesce(item, "stars", "starCount", 0),
+                        "downloads": _coalesce(item, "downloads", "downloadCount", 0),
+                        "updated_at": updated,
+                    },
+                )
+                jobs.append(job)
+
+            if caught_up or pending is None:
+                break
+            pages += 1
+
+        if pending is not None:
+            # Drop an unneeded prefetch without leaking its result/error
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+
+        # Single checkpoint write per poll
+        if newest_updated and newest_updated != last_updated:
             await self.save_checkpoint(newest_updated)
 
         return jobs
+
+
+def _coalesce(item: dict, key: str, alt: str, default: Any) -> Any:
+    """``item.get(key, item.get(alt, default))`` without the eager second lookup."""
+    try:
+        return item[key]
+    except KeyError:
+        return item.get(alt, default)
+
+
+def _updated_ts(value: str) -> float | None:
+    """Parse a ClawHub ``updatedAt`` (epoch number or ISO-8601) to a number."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        # Offset-less timestamps are UTC, not the host's local time
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
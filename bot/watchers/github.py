@@ -12,7 +12,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import OrderedDict
 
+from bot import jsonutil
 from bot.config import bot_settings
 from bot.filters import determine_priority
 from bot.queue import JobQueue, ScanJob
@@ -21,6 +23,11 @@ from bot.watchers.base import BaseWatcher
 logger = logging.getLogger(__name__)
 
 GITHUB_API = "https://api.github.com"
+GITHUB_SEARCH_URL = f"{GITHUB_API}/search/repositories"
+GITHUB_EVENTS_URL = f"{GITHUB_API}/events"
+
+# Repos remembered for push-event rescans; least recently seen are dropped
+KNOWN_REPOS_MAX = 10_000
 
 # Rotate through these search queries
 SEARCH_QUERIES = [
@@ -38,9 +45,13 @@ class GitHubWatcher(BaseWatcher):
 
     def __init__(self, queue: JobQueue) -> None:
         super().__init__(queue)
-        self._known_repos: dict[str, str] = {}  # full_name -> last_sha
+        # full_name -> last_sha, in least-recently-seen order
+        self._known_repos: OrderedDict[str, str] = OrderedDict()
         self._search_index = 0
         self._poll_count = 0
+        # ETags for conditional requests; a 304 costs no rate-limit budget
+        self._events_etag: str | None = None
+        self._search_etags: dict[tuple[str, int], str] = {}
 
     @property
     def name(self) -> str:
@@ -50,7 +61,14 @@ class GitHubWatcher(BaseWatcher):
     def poll_interval_seconds(self) -> int:
         return bot_settings.github_events_interval
 
-    def _headers(self) -> dict[str, str]:
+    def _remember_repo(self, full_name: str, sha: str) -> None:
+        """Record a repo's latest version, evicting the stalest beyond the cap."""
+        self._known_repos[full_name] = sha
+        self._known_repos.move_to_end(full_name)
+        if len(self._known_repos) > KNOWN_REPOS_MAX:
+            self._known_repos.popitem(last=False)
+
+    def _default_headers(self) -> dict[str, str]:
         headers = {"Accept": "application/vnd.github+json"}
         if bot_settings.github_configured:
             headers["Authorization"] = f"Bearer {bot_settings.github_token}"
@@ -58,22 +76,20 @@ class GitHubWatcher(BaseWatcher):
 
     async def poll(self) -> list[ScanJob]:
         """Poll GitHub for new/updated MCP server repos."""
-        import httpx
-
-        jobs: list[ScanJob] = []
         self._poll_count += 1
 
-        async with httpx.AsyncClient(timeout=30, headers=self._headers()) as client:
-            # Every 24th poll (~12 hours at 30-min interval): search sweep
-            if self._poll_count % 24 == 1:
-                search_jobs = await self._search_sweep(client)
-                jobs.extend(search_jobs)
+        client = self.client
+        # Every poll: check events for known repos
+        if self._poll_count % 24 != 1:
+            return await self._check_events(client)
 
-            # Every poll: check events for known repos
-            event_jobs = await self._check_events(client)
-            jobs.extend(event_jobs)
-
-        return jobs
+        # Every 24th poll (~12 hours at 30-min interval): search sweep too.
+        # The endpoints have separate rate-limit buckets, so overlap them on
+        # the shared client; both log and swallow their own errors.
+        search_jobs, event_jobs = await asyncio.gather(
+            self._search_sweep(client), self._check_events(client)
+        )
+        return search_jobs + event_jobs
 
     async def _search_sweep(self, client) -> list[ScanJob]:
         """Search GitHub for MCP server repos using rotating queries."""
@@ -84,27 +100,41 @@ class GitHubWatcher(BaseWatcher):
         logger.info("GitHub search sweep: %r", query)
 
         try:
+            params = {
+                "q": query,
+                "sort": "updated",
+                "order": "desc",
+                "per_page": 100,
+            }
             page = 1
             while page <= 10:  # Max 10 pages per query
-                resp = await client.get(
-                    f"{GITHUB_API}/search/repositories",
-                    params={
-                        "q": query,
-                        "sort": "updated",
-                        "order": "desc",
-                        "per_page": 100,
-                        "page": page,
-                    },
-                )
-                if resp.status_code == 403:
+                params["page"] = page
+                etag = self._search_etags.get((query, page))
+                # Paced from the search quota's X-RateLimit-* headers
+                for _ in range(3):
+                    await self.rate_limiter.acquire()
+                    resp = await client.get(
+                        GITHUB_SEARCH_URL,
+                        params=params,
+                        headers={"If-None-Match": etag} if etag else None,
+                    )
+                    if not self.rate_limiter.observe(resp):
+                        break
+                if resp.status_code == 304:
+                    # Same results as this page's last sweep — already seen
+                    page += 1
+                    continue
+                if resp.status_code in (403, 429):
                     logger.warning("GitHub rate limit hit during search")
                     break
                 resp.raise_for_status()
-                data = resp.json()
+                data = jsonutil.loads(resp.content)
 
                 items = data.get("items", [])
                 if not items:
                     break
+                if new_etag := resp.headers.get("etag"):
+                    self._search_etags[(query, page)] = new_etag
 
                 for repo in items:
                     full_name = repo.get("full_name", "")
@@ -123,7 +153,7 @@ class GitHubWatcher(BaseWatcher):
                     if last_sha == current_sha and last_sha:
                         continue
 
-                    self._known_repos[full_name] = current_sha
+                    self._remember_repo(full_name, current_sha)
 
                     clone_url = repo.get("clone_url", "")
                     jobs.append(
@@ -145,7 +175,6 @@ class GitHubWatcher(BaseWatcher):
                     )
 
                 page += 1
-                await asyncio.sleep(2)  # Respect rate limits
 
         except Exception:
             logger.exception("GitHub search sweep failed")
@@ -161,13 +190,18 @@ class GitHubWatcher(BaseWatcher):
 
         try:
             resp = await client.get(
-                f"{GITHUB_API}/events",
+                GITHUB_EVENTS_URL,
                 params={"per_page": 100},
+                headers=(
+                    {"If-None-Match": self._events_etag} if self._events_etag else None
+                ),
             )
             if resp.status_code != 200:
+                # 304: no new events since the last poll
                 return jobs
+            self._events_etag = resp.headers.get("etag")
 
-            events = resp.json()
+            events = jsonutil.loads(resp.content)
             for event in events:
                 if event.get("type") != "PushEvent":
                     continue
@@ -182,10 +216,12 @@ class GitHubWatcher(BaseWatcher):
                 payload = event.get("payload", {})
                 head_sha = payload.get("head", "")
 
-                if self._known_repos.get(full_name) == head_sha:
+                # Active repos stay resident
+                self._known_repos.move_to_end(full_name)
+                if self._known_repos[full_name] == head_sha:
                     continue
 
-                self._known_repos[full_name] = head_sha
+                self._remember_repo(full_name, head_sha)
 
                 jobs.append(
                     ScanJob(
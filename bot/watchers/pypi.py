@@ -13,6 +13,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import xml.etree.ElementTree as ET
+import xmlrpc.client
 
 from bot.config import bot_settings
 from bot.filters import determine_priority, matches_ai_keywords
@@ -33,6 +34,9 @@ class PyPIWatcher(BaseWatcher):
         super().__init__(queue)
         self._last_serial: int | None = None
         self._poll_count = 0
+        # Reused across polls: xmlrpc's Transport keeps its HTTPS connection
+        # alive between requests.
+        self._xmlrpc: xmlrpc.client.ServerProxy | None = None
 
     @property
     def name(self) -> str:
@@ -44,6 +48,12 @@ class PyPIWatcher(BaseWatcher):
         # Use the faster interval; the poll method handles the logic
         return bot_settings.pypi_changelog_interval
 
+    async def aclose(self) -> None:
+        if self._xmlrpc is not None:
+            self._xmlrpc("close")()
+            self._xmlrpc = None
+        await super().aclose()
+
     async def poll(self) -> list[ScanJob]:
         """Poll PyPI for new packages."""
         jobs: list[ScanJob] = []
@@ -63,110 +73,123 @@ class PyPIWatcher(BaseWatcher):
 
     async def _poll_rss(self) -> list[ScanJob]:
         """Parse PyPI RSS feeds for new/updated packages."""
-        import httpx
-
         jobs: list[ScanJob] = []
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            for feed_url in [PYPI_RSS_NEW, PYPI_RSS_UPDATES]:
-                try:
-                    resp = await client.get(feed_url)
-                    resp.raise_for_status()
-                    root = ET.fromstring(resp.text)
-
-                    for item in root.findall(".//item"):
-                        title = item.findtext("title", "")
-                        link = item.findtext("link", "")
-
-                        # Parse "package-name 1.2.3" from title.
-                        # Some titles are "package-name added to PyPI" —
-                        # extract the first token as the name and try to
-                        # pull a version from the link URL instead.
-                        parts = title.rsplit(" ", 1)
-                        name = parts[0].strip() if parts else title.strip()
-                        version = parts[1].strip() if len(parts) > 1 else ""
-
-                        # Validate: name must be a PyPI identifier (no spaces)
-                        if " " in name:
-                            # Fall back to first word of the title
-                            name = title.split()[0].strip() if title.strip() else ""
-                        if not name:
-                            continue
-
-                        # Version must look like a version (digit-prefixed), not text
-                        if version and not version[0].isdigit():
-                            # Try extracting version from link URL
-                            # e.g. https://pypi.org/project/name/1.2.3/
-                            if link:
-                                url_parts = link.rstrip("/").rsplit("/", 1)
-                                candidate = url_parts[-1] if len(url_parts) > 1 else ""
-                                version = (
-                                    candidate
-                                    if candidate and candidate[0].isdigit()
-                                    else ""
-                                )
-                            else:
-                                version = ""
-
-                        # Fetch package metadata for keyword filtering
-                        meta = await self._fetch_package_meta(client, name)
-                        description = meta.get("summary", "")
-                        raw_kw = meta.get("keywords") or ""
-                        keywords_list = raw_kw.split(",") if raw_kw else []
-                        weekly_downloads = meta.get("downloads", {}).get("last_week", 0)
-
-                        if not matches_ai_keywords(name, description, keywords_list):
-                            continue
-
-                        priority = determine_priority(
-                            "pypi",
-                            name,
-                            description,
-                            keywords_list,
-                            weekly_downloads,
-                        )
-
-                        jobs.append(
-                            ScanJob(
-                                ecosystem="pypi",
-                                name=name,
-                                version=version,
-                                download_url="",  # pip download handles this
-                                priority=priority,
-                                metadata={
-                                    "author": meta.get("author", ""),
-                                    "description": description,
-                                    "keywords": keywords_list,
-                                    "published_at": item.findtext("pubDate", ""),
-                                    "source": "rss",
-                                },
+        client = self.client
+        for feed_url in [PYPI_RSS_NEW, PYPI_RSS_UPDATES]:
+            try:
+                resp = await client.get(feed_url)
+                resp.raise_for_status()
+                # Hand expat the raw bytes: no str decode, and the XML
+                # declaration's encoding is honoured.
+                root = ET.fromstring(resp.content)
+
+                entries: list[tuple[str, str, str]] = []
+                for item in root.findall(".//item"):
+                    title = item.findtext("title", "")
+                    link = item.findtext("link", "")
+
+                    # Parse "package-name 1.2.3" from title.
+                    # Some titles are "package-name added to PyPI" —
+                    # extract the first token as the name and try to
+                    # pull a version from the link URL instead.
+                    parts = title.rsplit(" ", 1)
+                    name = parts[0].strip() if parts else title.strip()
+                    version = parts[1].strip() if len(parts) > 1 else ""
+
+                    # Validate: name must be a PyPI identifier (no spaces)
+                    if " " in name:
+                        # Fall back to first word of the title
+                        name = title.split()[0].strip() if title.strip() else ""
+                    if not name:
+                        continue
+
+                    # Version must look like a version (digit-prefixed), not text
+                    if version and not version[0].isdigit():
+                        # Try extracting version from link URL
+                        # e.g. https://pypi.org/project/name/1.2.3/
+                        if link:
+                            url_parts = link.rstrip("/").rsplit("/", 1)
+                            candidate = url_parts[-1] if len(url_parts) > 1 else ""
+                            version = (
+                                candidate
+                                if candidate and candidate[0].isdigit()
+                                else ""
                             )
+                        else:
+                            version = ""
+
+                    entries.append((name, version, item.findtext("pubDate", "")))
+
+                # Fetch package metadata for keyword filtering, concurrently
+                # (bounded) so the HTTP/2 client multiplexes the lookups.
+                metas = await self._fetch_all(
+                    self._fetch_package_meta, (name for name, _, _ in entries)
+                )
+
+                for name, version, published_at in entries:
+                    meta = metas[name]
+                    description = meta.get("summary", "")
+                    raw_kw = meta.get("keywords") or ""
+                    keywords_list = raw_kw.split(",") if raw_kw else []
+                    weekly_downloads = meta.get("downloads", {}).get("last_week", 0)
+
+                    if not matches_ai_keywords(name, description, keywords_list):
+                        continue
+
+                    priority = determine_priority(
+                        "pypi",
+                        name,
+                        description,
+                        keywords_list,
+                        weekly_downloads,
+                    )
+
+                    jobs.append(
+                        ScanJob(
+                            ecosystem="pypi",
+                            name=name,
+                            version=version,
+                            download_url="",  # pip download handles this
+                            priority=priority,
+                            metadata={
+                                "author": meta.get("author", ""),
+                                "description": description,
+                                "keywords": keywords_list,
+                                "published_at": published_at,
+                                "source": "rss",
+                            },
                         )
+                    )
 
-                except Exception:
-                    logger.exception("PyPI RSS poll failed for %s", feed_url)
+            except Exception:
+                logger.exception("PyPI RSS poll failed for %s", feed_url)
 
         return jobs
 
     async def _poll_changelog(self) -> list[ScanJob]:
         """Use XML-RPC changelog_since_serial for incremental updates."""
-        import xmlrpc.client
-
         jobs: list[ScanJob] = []
 
         try:
             # Run XML-RPC calls in a thread to avoid blocking
             def _xmlrpc_call():
-                client = xmlrpc.client.ServerProxy(
-                    "https://pypi.org/pypi", use_builtin_types=True
-                )
+                if self._xmlrpc is None:
+                    self._xmlrpc = xmlrpc.client.ServerProxy(
+                        PYPI_JSON_API, use_builtin_types=True
+                    )
+                client = self._xmlrpc
                 if self._last_serial is None:
                     # First run: get current serial, don't backfill
                     serial = client.changelog_last_serial()
                     return serial, []
                 changes = client.changelog_since_serial(self._last_serial)
-                new_serial = client.changelog_last_serial()
-                return new_serial, changes
+                # Each change carries its serial; the newest one is the new
+                # checkpoint. Saves a round trip, and unlike a separate
+                # changelog_last_serial() call it can't skip changes that
+                # landed between the two requests.
+                serials = [c[4] for c in changes if len(c) > 4]
+                return max(serials, default=self._last_serial), changes
 
             # Load checkpoint if first run
             if self._last_serial is None:
@@ -186,7 +209,10 @@ class PyPIWatcher(BaseWatcher):
             # Process changes: each is (name, version, timestamp, action, serial)
             # Note: PyPI XML-RPC may return varying tuple lengths and action
             # formats.  Sanitise aggressively to avoid corrupted job names.
-            seen: set[str] = set()
+            seen: set[tuple[str, str]] = set()
+            # One keyword check per name — a release with many files (and a
+            # package with several versions) repeats the same name.
+            ai_names: dict[str, bool] = {}
             for change in changes:
                 if len(change) < 4:
                     continue
@@ -207,13 +233,16 @@ class PyPIWatcher(BaseWatcher):
                 if not any(kw in action_str for kw in ("new", "create", "add")):
                     continue
 
-                dedup_key = f"{name}:{version}"
+                dedup_key = (name, version)
                 if dedup_key in seen:
                     continue
                 seen.add(dedup_key)
 
                 # Quick keyword check on name alone (no API call for changelog events)
-                if not matches_ai_keywords(name):
+                is_ai = ai_names.get(name)
+                if is_ai is None:
+                    is_ai = ai_names[name] = matches_ai_keywords(name)
+                if not is_ai:
                     continue
 
                 priority = determine_priority("pypi", name)
@@ -240,10 +269,12 @@ class PyPIWatcher(BaseWatcher):
     async def _fetch_package_meta(self, client, name: str) -> dict:
         """Fetch package metadata from PyPI JSON API."""
         try:
-            resp = await client.get(f"{PYPI_JSON_API}/{name}/json")
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("info", {})
+            # Only "info" is used; don't keep every release in the cache
+            return await self._get_json_cached(
+                client,
+                f"{PYPI_JSON_API}/{name}/json",
+                extract=lambda data: data.get("info", {}),
+            )
         except Exception:
             pass
         return {}
@@ -14,8 +14,9 @@ This feeds into Initiative 2 (State of Agent Skill Security Report) by:
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 
 import httpx
 
@@ -27,16 +28,32 @@ from bot.watchers.skills_client import SkillsClient, SkillInfo
 
 logger = logging.getLogger(__name__)
 
+# Audit batches in flight at once against add-skill.vercel.sh
+AUDIT_CONCURRENCY = 6
+
+# Skill IDs kept in the checkpoint (most recently enqueued)
+CHECKPOINT_MAX_SKILLS = 10_000
+
+# Weight of the latest poll in each discovery query's new-skill yield average
+QUERY_YIELD_ALPHA = 0.3
+
 
 class SkillsWatcher(BaseWatcher):
     """Monitors skills.sh for new and updated agent skills."""
 
     def __init__(self, queue: JobQueue) -> None:
         super().__init__(queue)
-        self._client = SkillsClient()
+        self._skills = SkillsClient()
         self._known_skills: set[str] = set()  # skill IDs already enqueued
+        # Checkpointed IDs in enqueue order; oldest fall off past the cap
+        self._recent_skills: deque[str] = deque(maxlen=CHECKPOINT_MAX_SKILLS)
+        self._checkpoint_dirty = False
         self._initial_crawl_done = False
-        self._discovery_index = 0
+        # Incremental discovery scheduling: per-query new-skill yield (EMA)
+        # and the poll number each query last ran in
+        self._poll_seq = 0
+        self._query_yield: dict[str, float] = {}
+        self._query_last_poll: dict[str, int] = {}
 
     @property
     def name(self) -> str:
@@ -46,6 +63,16 @@ class SkillsWatcher(BaseWatcher):
     def poll_interval_seconds(self) -> int:
         return bot_settings.skills_poll_interval
 
+    def _remember_skill(self, skill_id: str) -> None:
+        """Mark a skill as enqueued and queue it for the next checkpoint."""
+        self._known_skills.add(skill_id)
+        self._recent_skills.append(skill_id)
+        self._checkpoint_dirty = True
+
+    async def aclose(self) -> None:
+        await self._skills.aclose()
+        await super().aclose()
+
     async def poll(self) -> list[ScanJob]:
         """Discover skills and enqueue scan jobs for new ones."""
         jobs: list[ScanJob] = []
@@ -54,23 +81,24 @@ class SkillsWatcher(BaseWatcher):
         if not self._known_skills:
             cp = await self.load_checkpoint()
             if cp:
-                self._known_skills = set(cp.split(",")) if cp else set()
+                ids = cp.split(",")
+                self._known_skills = set(ids)
+                self._recent_skills.extend(ids)
                 self._initial_crawl_done = bool(self._known_skills)
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            if not self._initial_crawl_done:
-                # Initial crawl: discover all skills systematically
-                jobs = await self._initial_crawl(client)
-                self._initial_crawl_done = True
-            else:
-                # Subsequent polls: incremental discovery with rotating queries
-                jobs = await self._incremental_poll(client)
-
-        # Save checkpoint
-        if self._known_skills:
-            # Limit checkpoint size — store the most recent 10K skill IDs
-            checkpoint_ids = sorted(self._known_skills)[-10000:]
-            await self.save_checkpoint(",".join(checkpoint_ids))
+        client = self.client
+        if not self._initial_crawl_done:
+            # Initial crawl: discover all skills systematically
+            jobs = await self._initial_crawl(client)
+            self._initial_crawl_done = True
+        else:
+            # Subsequent polls: incremental discovery with rotating queries
+            jobs = await self._incremental_poll(client)
+
+        # Save checkpoint only when new skills were enqueued
+        if self._checkpoint_dirty:
+            await self.save_checkpoint(",".join(self._recent_skills))
+            self._checkpoint_dirty = False
 
         return jobs
 
@@ -78,30 +106,37 @@ class SkillsWatcher(BaseWatcher):
         """Run a full discovery crawl using systematic search queries."""
         logger.info("Skills watcher: starting initial crawl")
 
-        skills = await self._client.discover_all(client=client, delay=1.0)
+        skills = await self._skills.discover_all(client=client)
         return await self._process_skills(skills, client)
 
     async def _incremental_poll(self, client: httpx.AsyncClient) -> list[ScanJob]:
         """Check for new skills using a subset of search queries per poll."""
         from bot.watchers.skills_client import _DISCOVERY_QUERIES
 
-        # Rotate through queries per poll cycle (configurable via SIGIL_BOT_SKILLS_CRAWL_BATCH_SIZE)
-        batch_size = bot_settings.skills_crawl_batch_size
-        queries = _DISCOVERY_QUERIES
-        start = self._discovery_index % len(queries)
-        batch = queries[start : start + batch_size]
-        if len(batch) < batch_size:
-            batch += queries[: batch_size - len(batch)]
-        self._discovery_index += batch_size
-
-        all_skills: list[SkillInfo] = []
-        for query in batch:
-            results = await self._client.search(query, limit=50, client=client)
-            all_skills.extend(results)
-            await asyncio.sleep(0.5)
+        # Pick this poll's queries (count via SIGIL_BOT_SKILLS_CRAWL_BATCH_SIZE)
+        # by recent yield × polls since last run: productive prefixes come
+        # round often, cold ones still age back in. With no yield history
+        # this is a plain rotation through the list.
+        self._poll_seq += 1
+        seq = self._poll_seq
+
+        def score(query: str) -> float:
+            age = seq - self._query_last_poll.get(query, 0)
+            return (1.0 + self._query_yield.get(query, 0.0)) * age
+
+        batch = heapq.nlargest(
+            bot_settings.skills_crawl_batch_size, _DISCOVERY_QUERIES, key=score
+        )
+        results = await self._skills.search_many(batch, limit=50, client=client)
 
         # Only process skills we haven't seen
-        new_skills = [s for s in all_skills if s.id not in self._known_skills]
+        new_skills: list[SkillInfo] = []
+        for query, found in results.items():
+            fresh = [s for s in found if s.id not in self._known_skills]
+            new_skills.extend(fresh)
+            self._query_last_poll[query] = seq
+            prev = self._query_yield.get(query, 0.0)
+            self._query_yield[query] = prev + QUERY_YIELD_ALPHA * (len(fresh) - prev)
         if new_skills:
             logger.info(
                 "Skills watcher: found %d new skills in incremental poll",
@@ -118,48 +153,70 @@ class SkillsWatcher(BaseWatcher):
         if not skills:
             return []
 
-        # Deduplicate
+        # Deduplicate, keeping only skills with a source repo to clone, and
+        # group them by source for batched audit fetches in the same pass
         unique: dict[str, SkillInfo] = {}
+        by_source: dict[str, list[SkillInfo]] = defaultdict(list)
         for s in skills:
-            if s.id and s.id not in self._known_skills:
-                unique[s.id] = s
+            if not s.id or not s.source:
+                continue
+            if s.id in self._known_skills or s.id in unique:
+                continue
+            unique[s.id] = s
+            by_source[s.source].append(s)
 
         if not unique:
             return []
 
-        # Group skills by source repo for batched audit fetches
-        by_source: dict[str, list[SkillInfo]] = defaultdict(list)
-        for skill in unique.values():
-            if skill.source:
-                by_source[skill.source].append(skill)
-
-        # Fetch audit data in batches per source repo
-        audit_data: dict[str, dict] = {}  # skill_id -> provider assessments
+        # Fetch audit data in batches per source repo, batches in parallel
+        batches: list[tuple[str, list[str]]] = []
         for source, source_skills in by_source.items():
             slugs = [s.skill_id for s in source_skills]
             # Batch in groups of 10 to avoid URL length limits
             for i in range(0, len(slugs), 10):
-                batch_slugs = slugs[i : i + 10]
-                try:
-                    results = await self._client.fetch_audits(
-                        source, batch_slugs, client=client
-                    )
-                    for skill_name, audit_result in results.items():
-                        # Map back to full skill ID
-                        for sk in source_skills:
-                            if sk.skill_id == skill_name or sk.name == skill_name:
-                                audit_data[sk.id] = audit_result.to_metadata()
-                                break
-                except Exception:
-                    logger.debug("Failed to fetch audits for %s", source, exc_info=True)
-                await asyncio.sleep(0.5)
+                batches.append((source, slugs[i : i + 10]))
+
+        sem = asyncio.Semaphore(AUDIT_CONCURRENCY)
+
+        async def fetch(source: str, slugs: list[str]) -> dict:
+            async with sem:
+                return await self._skills.fetch_audits(source, slugs, client=client)
+
+        batch_results = await asyncio.gather(
+            *(fetch(source, slugs) for source, slugs in batches),
+            return_exceptions=True,
+        )
+
+        # Audit keys are skill slugs or names; map them back per source repo
+        # (first skill in the source wins on a clash).
+        lookups: dict[str, dict[str, SkillInfo]] = {}
+        for source, source_skills in by_source.items():
+            lookup = lookups[source] = {}
+            for sk in source_skills:
+                lookup.setdefault(sk.skill_id, sk)
+                lookup.setdefault(sk.name, sk)
+
+        audit_data: dict[str, dict] = {}  # skill_id -> provider assessments
+        # Skills with identical assessments share one (read-only) metadata dict
+        shared_meta: dict[tuple, dict] = {}
+        for (source, _), results in zip(batches, batch_results):
+            if isinstance(results, BaseException):
+                logger.debug("Failed to fetch audits for %s", source, exc_info=results)
+                continue
+            lookup = lookups[source]
+            for skill_name, audit_result in results.items():
+                sk = lookup.get(skill_name)
+                if sk is None:
+                    continue
+                key = tuple(audit_result.assessments.items())
+                meta = shared_meta.get(key)
+                if meta is None:
+                    meta = shared_meta[key] = audit_result.to_metadata()
+                audit_data[sk.id] = meta
 
         # Build scan jobs
         jobs: list[ScanJob] = []
         for skill_id, skill in unique.items():
-            if not skill.source:
-                continue
-
             # Build GitHub clone URL from source (owner/repo)
             clone_url = f"https://github.com/{skill.source}.git"
 
@@ -183,7 +240,7 @@ class SkillsWatcher(BaseWatcher):
                 )
             )
 
-            self._known_skills.add(skill_id)
+            self._remember_skill(skill_id)
 
         logger.info(
             "Skills watcher: enqueuing %d scan jobs (%d total known)",
@@ -13,16 +13,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import sys
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Self
 
 import httpx
 
+from bot import jsonutil
+
 logger = logging.getLogger(__name__)
 
 SEARCH_API = "https://skills.sh/api/search"
 AUDIT_API = "https://add-skill.vercel.sh/audit"
 
+# Search queries in flight at once during discovery fan-out
+SEARCH_CONCURRENCY = 8
+
 # Alphabetic + numeric prefixes for systematic discovery
 # (search API requires min 2 chars)
 _DISCOVERY_QUERIES = [
@@ -117,7 +123,7 @@ _DISCOVERY_QUERIES = [
 ]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SkillInfo:
     """Metadata for a single skill from the skills.sh directory."""
 
@@ -128,9 +134,9 @@ class SkillInfo:
     installs: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProviderAssessment:
-    """Security assessment from a third-party auditor."""
+    """Security assessment from a third-party auditor (hashable)."""
 
     risk: str = "unknown"  # safe, low, medium, high, critical, unknown
     alerts: int = 0
@@ -138,7 +144,7 @@ class ProviderAssessment:
     analyzed_at: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillAuditResult:
     """Combined audit results for a skill from all providers."""
 
@@ -163,6 +169,34 @@ class SkillsClient:
 
     def __init__(self, timeout: float = 15.0) -> None:
         self._timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client used when a call is not given one explicitly."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+                http2=True,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the internal client, if one was opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def search(
         self,
@@ -192,7 +226,7 @@ class SkillsClient:
                     )
                     return []
 
-                data = resp.json()
+                data = jsonutil.loads(resp.content)
                 skills: list[SkillInfo] = []
                 for s in data.get("skills", []):
                     skills.append(
@@ -200,7 +234,9 @@ class SkillsClient:
                             id=s.get("id", ""),
                             skill_id=s.get("skillId", s.get("id", "")),
                             name=s.get("name", ""),
-                            source=s.get("source", ""),
+                            # Many skills share a repo: intern so grouping by
+                            # source hashes/compares one shared object
+                            source=sys.intern(s.get("source") or ""),
                             installs=s.get("installs", 0),
                         )
                     )
@@ -209,11 +245,7 @@ class SkillsClient:
                 logger.debug("skills.sh search error for q=%r", query, exc_info=True)
                 return []
 
-        if client:
-            return await _do(client)
-
-        async with httpx.AsyncClient(timeout=self._timeout) as c:
-            return await _do(c)
+        return await _do(client or self.client)
 
     async def fetch_audits(
         self,
@@ -249,7 +281,7 @@ class SkillsClient:
                     )
                     return {}
 
-                data = resp.json()
+                data = jsonutil.loads(resp.content)
                 results: dict[str, SkillAuditResult] = {}
                 for skill_name, providers in data.items():
                     audit = SkillAuditResult(skill_name=skill_name)
@@ -266,16 +298,36 @@ class SkillsClient:
                 logger.debug("skills.sh audit error for %s", source, exc_info=True)
                 return {}
 
-        if client:
-            return await _do(client)
+        return await _do(client or self.client)
 
-        async with httpx.AsyncClient(timeout=self._timeout) as c:
-            return await _do(c)
+    async def search_many(
+        self,
+        queries: list[str],
+        limit: int = 10,
+        client: httpx.AsyncClient | None = None,
+        concurrency: int = SEARCH_CONCURRENCY,
+    ) -> dict[str, list[SkillInfo]]:
+        """Run ``search`` for every query, at most ``concurrency`` at a time.
+
+        Returns each query's results (not deduplicated), in query order. A
+        failed query maps to an empty list, as with ``search``.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(c: httpx.AsyncClient, query: str) -> list[SkillInfo]:
+            async with sem:
+                return await self.search(query, limit=limit, client=c)
+
+        async def _do(c: httpx.AsyncClient) -> dict[str, list[SkillInfo]]:
+            results = await asyncio.gather(*(one(c, q) for q in queries))
+            return dict(zip(queries, results))
+
+        return await _do(client or self.client)
 
     async def discover_all(
         self,
         client: httpx.AsyncClient | None = None,
-        delay: float = 1.0,
+        concurrency: int = SEARCH_CONCURRENCY,
     ) -> list[SkillInfo]:
         """Enumerate skills by running systematic search queries.
 
@@ -284,28 +336,19 @@ class SkillsClient:
 
         Args:
             client: Optional shared httpx client.
-            delay: Seconds between queries (rate limiting).
+            concurrency: Maximum search queries in flight at once.
 
         Returns:
             Deduplicated list of all discovered skills.
         """
+        results = await self.search_many(
+            _DISCOVERY_QUERIES, limit=50, client=client, concurrency=concurrency
+        )
         seen: dict[str, SkillInfo] = {}
-
-        async def _search(c: httpx.AsyncClient, query: str) -> None:
-            results = await self.search(query, limit=50, client=c)
-            for skill in results:
+        for batch in results.values():
+            for skill in batch:
                 if skill.id and skill.id not in seen:
                     seen[skill.id] = skill
 
-        if client:
-            for query in _DISCOVERY_QUERIES:
-                await _search(client, query)
-                await asyncio.sleep(delay)
-        else:
-            async with httpx.AsyncClient(timeout=self._timeout) as c:
-                for query in _DISCOVERY_QUERIES:
-                    await _search(c, query)
-                    await asyncio.sleep(delay)
-
         logger.info("skills.sh discovery complete: %d unique skills found", len(seen))
         return list(seen.values())
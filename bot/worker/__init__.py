@@ -10,53 +10,80 @@ Each worker is a long-lived asyncio task. Can run multiple concurrently.
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import logging
+import multiprocessing
+import shutil
+import tarfile
 import tempfile
 import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from types import ModuleType
+from typing import Any
 
 from bot.config import bot_settings
+from bot.intelligence import schedule_intelligence
+from bot.publisher import publish_scan
 from bot.queue import JobQueue, ScanJob
 from bot.store import store_scan_result, store_scan_error
 
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _crawler() -> ModuleType | None:
+    """The API crawler module (resolved once), or None when not installed."""
+    try:
+        from api.services import crawler
+    except ImportError:
+        return None
+    return crawler
+
+
+async def _download_clawhub(target: Any, dest: str) -> bool:
+    """ClawHub uses ZIP download via httpx."""
+    from api.services.clawhub_crawler import ClawHubSkill, download_skill
+
+    skill = ClawHubSkill(slug=target.name, version=target.version)
+    return await download_skill(skill, dest)
+
+
+@functools.cache
+def _download_dispatch() -> dict[str, Callable[[Any, str], Awaitable[bool]]]:
+    """Crawler download function per ecosystem (git clone for anything else)."""
+    crawler = _crawler()
+    if crawler is None:
+        return {}
+    return {
+        "npm": crawler._download_npm,
+        "pip": crawler._download_pip,
+        "pypi": crawler._download_pip,
+        "clawhub": _download_clawhub,
+        "github": crawler._download_git,
+    }
+
+
 async def _download_and_extract(job: ScanJob, dest: str) -> bool:
     """Download and extract a package to dest directory.
 
     Delegates to the existing crawler's download functions.
     """
+    dispatch = _download_dispatch()
+    if not dispatch:
+        return await _download_fallback(job, dest)
     try:
-        from api.services.crawler import (
-            CrawlTarget,
-            _download_npm,
-            _download_pip,
-            _download_git,
-        )
-
-        target = CrawlTarget(
+        target = _crawler().CrawlTarget(
             ecosystem=job.ecosystem,
             name=job.name,
             version=job.version,
             url=job.download_url,
         )
-
-        if job.ecosystem == "npm":
-            return await _download_npm(target, dest)
-        elif job.ecosystem in ("pip", "pypi"):
-            return await _download_pip(target, dest)
-        elif job.ecosystem == "clawhub":
-            # ClawHub uses ZIP download via httpx
-            from api.services.clawhub_crawler import ClawHubSkill, download_skill
-
-            skill = ClawHubSkill(slug=job.name, version=job.version)
-            return await download_skill(skill, dest)
-        elif job.ecosystem == "github":
-            return await _download_git(target, dest)
-        else:
-            return await _download_git(target, dest)
+        download = dispatch.get(job.ecosystem, dispatch["github"])
+        return await download(target, dest)
 
     except ImportError:
         # Fallback: use subprocess commands directly
@@ -82,15 +109,7 @@ async def _download_fallback(job: ScanJob, dest: str) -> bool:
                 return False
             # Extract tarballs
             for tgz in Path(dest).glob("*.tgz"):
-                await asyncio.create_subprocess_exec(
-                    "tar",
-                    "xzf",
-                    str(tgz),
-                    "-C",
-                    dest,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
+                await asyncio.to_thread(_extract_tarball, tgz, dest)
             return True
 
         elif job.ecosystem in ("pip", "pypi"):
@@ -109,32 +128,21 @@ async def _download_fallback(job: ScanJob, dest: str) -> bool:
             if proc.returncode != 0:
                 return False
             for archive in Path(dest).glob("*.tar.gz"):
-                await asyncio.create_subprocess_exec(
-                    "tar",
-                    "xzf",
-                    str(archive),
-                    "-C",
-                    dest,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
+                await asyncio.to_thread(_extract_tarball, archive, dest)
             return True
 
         else:
             # Git clone
             url = job.download_url or f"https://github.com/{job.name}.git"
-            proc = await asyncio.create_subprocess_exec(
-                "git",
-                "clone",
-                "--depth",
-                "1",
-                url,
-                f"{dest}/repo",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await asyncio.wait_for(proc.communicate(), timeout=120)
-            return proc.returncode == 0
+            repo_dir = f"{dest}/repo"
+            # Skills live in one subdirectory of (often large) multi-skill
+            # repos: fetch only that subtree when we know where it is
+            skill_path = job.metadata.get("skill_path", "")
+            if job.ecosystem == "skills" and skill_path:
+                if await _sparse_clone(url, repo_dir, skill_path):
+                    return True
+                shutil.rmtree(repo_dir, ignore_errors=True)
+            return await _git("clone", "--depth", "1", url, repo_dir)
 
     except Exception as e:
         logger.warning(
@@ -143,34 +151,145 @@ async def _download_fallback(job: ScanJob, dest: str) -> bool:
         return False
 
 
+async def _git(*args: str) -> bool:
+    """Run a git command, returning True on a zero exit status."""
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    await asyncio.wait_for(proc.communicate(), timeout=120)
+    return proc.returncode == 0
+
+
+async def _sparse_clone(url: str, repo_dir: str, subdir: str) -> bool:
+    """Shallow partial clone of ``url`` with only ``subdir`` checked out.
+
+    Returns False (leaving cleanup to the caller) if any step fails or the
+    subdirectory does not exist in the repository.
+    """
+    if not await _git(
+        "clone", "--depth", "1", "--filter=blob:none", "--sparse", url, repo_dir
+    ):
+        return False
+    if not await _git("-C", repo_dir, "sparse-checkout", "set", subdir):
+        return False
+    return (Path(repo_dir) / subdir).is_dir()
+
+
+def _archive_hash(directory: str) -> str:
+    """SHA-256 of the downloaded package archive, or "" if there is none."""
+    for ext in ("*.tgz", "*.tar.gz", "*.whl", "*.zip"):
+        archives = list(Path(directory).glob(ext))
+        if archives:
+            h = hashlib.sha256()
+            with open(archives[0], "rb") as af:
+                for chunk in iter(lambda: af.read(65536), b""):
+                    h.update(chunk)
+            return h.hexdigest()
+    return ""
+
+
+def _extract_tarball(archive: Path, dest: str) -> None:
+    """Extract a gzipped tarball into dest (blocking; run in a thread).
+
+    The ``data`` filter refuses absolute paths, links escaping ``dest`` and
+    device files, so a hostile archive cannot write outside the temp dir.
+    """
+    with tarfile.open(archive, "r:gz") as tf:
+        tf.extractall(dest, filter="data")
+
+
+def _scan_sync(directory: str) -> dict:
+    """Scan a directory with the in-process Python scanner (blocking).
+
+    Runs in a scan-pool process; raises ImportError when the API scanner
+    package is not installed.
+    """
+    from api.services.scanner import scan_directory_with_count
+    from api.services.scoring import compute_verdict
+    from api.services.scanner_v2 import calculate_confidence_summary
+
+    start = time.monotonic()
+    # One tree walk for both the findings and the file count
+    findings, file_count = scan_directory_with_count(directory)
+    score, verdict = compute_verdict(findings)
+    elapsed = int((time.monotonic() - start) * 1000)
+
+    # Calculate confidence summary for v2 enhanced output
+    confidence_summary = calculate_confidence_summary(findings)
+
+    return {
+        "score": round(score, 2),
+        "verdict": verdict.value,
+        "files_scanned": file_count,
+        "findings": [f.model_dump(mode="json") for f in findings],
+        "duration_ms": elapsed,
+        "scanner_version": "2.0.0",
+        "confidence_summary": confidence_summary.model_dump(mode="json"),
+    }
+
+
+_scan_pool: ProcessPoolExecutor | None = None
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    """Return the process pool for CPU-bound scans, creating it on first use.
+
+    One process per worker coroutine, so concurrent scans use separate cores
+    and a long scan never blocks the event loop. ``spawn`` keeps the
+    children free of the parent's event loop, sockets and threads.
+    """
+    global _scan_pool
+    if _scan_pool is None:
+        _scan_pool = ProcessPoolExecutor(
+            max_workers=bot_settings.max_concurrent_scans,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _scan_pool
+
+
+def _discard_scan_pool(pool: ProcessPoolExecutor) -> None:
+    """Shut ``pool`` down and kill its processes, so the next scan starts a
+    fresh pool. A scan cannot be cancelled once its child has picked it up,
+    so this is the only way to get a stalled scan off a worker process."""
+    global _scan_pool
+    if _scan_pool is pool:
+        _scan_pool = None
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in processes:
+        proc.terminate()
+
+
+def shutdown_scan_pool() -> None:
+    """Stop the scan processes (called on bot shutdown)."""
+    if _scan_pool is not None:
+        _discard_scan_pool(_scan_pool)
+
+
 async def _run_scan(directory: str) -> dict | None:
     """Run Sigil scan on a directory. Returns parsed scan output."""
     # Prefer the Python scanner directly with Scanner v2 enhancements
+    loop = asyncio.get_running_loop()
+    pool = _get_scan_pool()
     try:
-        from api.services.scanner import scan_directory, count_scannable_files
-        from api.services.scoring import compute_verdict
-        from api.services.scanner_v2 import calculate_confidence_summary
-
-        start = time.monotonic()
-        findings = scan_directory(directory)
-        score, verdict = compute_verdict(findings)
-        file_count = count_scannable_files(directory)
-        elapsed = int((time.monotonic() - start) * 1000)
-        
-        # Calculate confidence summary for v2 enhanced output
-        confidence_summary = calculate_confidence_summary(findings)
-        
-        return {
-            "score": round(score, 2),
-            "verdict": verdict.value,
-            "files_scanned": file_count,
-            "findings": [f.model_dump(mode="json") for f in findings],
-            "duration_ms": elapsed,
-            "scanner_version": "2.0.0",
-            "confidence_summary": confidence_summary.model_dump(mode="json"),
-        }
+        return await loop.run_in_executor(pool, _scan_sync, directory)
     except ImportError:
         pass
+    except BrokenProcessPool:
+        # A scan process died (e.g. OOM on a hostile package); start a fresh
+        # pool for later jobs and let this one retry
+        _discard_scan_pool(pool)
+        logger.warning("Scan process died while scanning %s", directory)
+        return None
+    except asyncio.CancelledError:
+        # Timed out (or the bot is stopping): the child keeps scanning
+        # regardless, so recycle the pool rather than lose the process.
+        # Scans sharing the pool fail with BrokenProcessPool and retry.
+        _discard_scan_pool(pool)
+        raise
 
     # Fallback to CLI
     try:
@@ -232,22 +351,14 @@ async def process_job(job: ScanJob, queue: JobQueue) -> None:
                 )
                 return
 
-            # 1b. Compute archive hash for attestation subject digest
-            archive_hash = ""
-            for ext in ("*.tgz", "*.tar.gz", "*.whl", "*.zip"):
-                archives = list(Path(tmpdir).glob(ext))
-                if archives:
-                    h = hashlib.sha256()
-                    with open(archives[0], "rb") as af:
-                        for chunk in iter(lambda: af.read(8192), b""):
-                            h.update(chunk)
-                    archive_hash = h.hexdigest()
-                    break
-
-            # 2. Scan
-            scan_output = await asyncio.wait_for(
-                _run_scan(tmpdir),
-                timeout=bot_settings.scan_timeout,
+            # 1b + 2. Hash the archive (attestation subject digest) in a
+            # thread while the scan runs — neither depends on the other
+            archive_hash, scan_output = await asyncio.gather(
+                asyncio.to_thread(_archive_hash, tmpdir),
+                asyncio.wait_for(
+                    _run_scan(tmpdir),
+                    timeout=bot_settings.scan_timeout,
+                ),
             )
             if not scan_output:
                 if job.retries < job.max_retries:
@@ -277,9 +388,7 @@ async def process_job(job: ScanJob, queue: JobQueue) -> None:
             content_digest = None
             log_entry_id = None
             try:
-                from bot.config import bot_settings as _bs
-
-                if _bs.signing_configured:
+                if bot_settings.signing_configured:
                     from bot.attestation import create_attestation
 
                     (
@@ -314,17 +423,13 @@ async def process_job(job: ScanJob, queue: JobQueue) -> None:
 
             # 5. Publish
             try:
-                from bot.publisher import publish_scan
-
                 await publish_scan(scan_id, job, scan_output)
             except Exception:
                 logger.exception("Publish failed for %s (non-fatal)", scan_id)
 
             # 6. Intelligence extraction (async, non-blocking)
             try:
-                from bot.intelligence import extract_intelligence
-
-                await extract_intelligence(job, scan_output)
+                schedule_intelligence(job, scan_output)
             except Exception:
                 logger.debug("Intelligence extraction skipped: %s", job.name)
 
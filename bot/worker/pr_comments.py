@@ -16,37 +16,155 @@ Requires GitHub App credentials:
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
 import logging
+import random
 import re
 import time
+import weakref
 from datetime import datetime, timezone
 from typing import Any
 
 import httpx
 
+from api.database import PR_EVENTS_WAKEUP_KEY
+from bot import jsonutil
+from bot.watchers.base import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 # GitHub API base
 GITHUB_API = "https://api.github.com"
 
+# A PR has a single github_pr_events row that every push re-queues; events
+# are only claimed once their row has been quiet this long, so a burst of
+# pushes is scanned and commented on once
+PR_EVENT_DEBOUNCE_SECONDS = 10
+
+# created_at is stamped by the API host but compared against the database
+# clock, so a woken worker waits a little past the debounce window
+PR_EVENT_DEBOUNCE_SLACK_SECONDS = 2
+
+# Installation tokens live for an hour; reuse them until shortly before
+# expiry instead of signing a JWT and exchanging it for every event
+TOKEN_EXPIRY_MARGIN = 60.0
+_token_cache: dict[int, tuple[str, float]] = {}
+_token_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+
+
+# ---------------------------------------------------------------------------
+# GitHub rate limiting
+# ---------------------------------------------------------------------------
+
+
+# Retries for one GitHub call, and the cap on the backoff between them
+GITHUB_MAX_ATTEMPTS = 5
+GITHUB_MAX_BACKOFF = 32.0
+
+# One limiter per credential (an installation token or the App JWT), since
+# GitHub tracks each quota separately
+_rate_limiters: dict[str, RateLimiter] = {}
+
+# Transport failures that happen before the request reaches GitHub
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+async def _github_request(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    key: str,
+    stream: bool = False,
+    idempotent: bool = True,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Send a request with ``client``, paced by the quota of credential ``key``.
+
+    A throttled response is retried once the limiter allows; 5xx responses
+    and transport errors are retried with jittered exponential backoff, up
+    to ``GITHUB_MAX_ATTEMPTS`` tries in all. With ``stream=True`` the body is
+    left unread; the caller must close the response. Requests that are not
+    ``idempotent`` are only retried when GitHub cannot have acted on them
+    (throttled, or the connection never opened), so a flaky 502 cannot post
+    the same comment twice.
+    """
+    limiter = _rate_limiters.setdefault(
+        key, RateLimiter(max_backoff=GITHUB_MAX_BACKOFF)
+    )
+    attempt = 0
+    while True:
+        attempt += 1
+        last = attempt >= GITHUB_MAX_ATTEMPTS
+        await limiter.acquire()
+        try:
+            resp = await client.send(
+                client.build_request(method, url, **kwargs), stream=stream
+            )
+        except httpx.TransportError as exc:
+            if last or not (idempotent or isinstance(exc, _NOT_SENT_ERRORS)):
+                raise
+            logger.warning("GitHub request failed (%s), retrying", exc)
+            await asyncio.sleep(_backoff(attempt))
+            continue
+
+        throttled = limiter.observe(resp)
+        if last or not (throttled or (idempotent and resp.status_code >= 500)):
+            return resp
+        await resp.aclose()
+        if throttled:
+            logger.warning("GitHub throttled %s %s, retrying", method, url)
+        else:
+            logger.warning("GitHub returned %d, retrying", resp.status_code)
+            await asyncio.sleep(_backoff(attempt))
+
+
+def _backoff(attempt: int) -> float:
+    """Seconds before retry ``attempt + 1``: 1, 2, 4, ... plus jitter."""
+    return min(GITHUB_MAX_BACKOFF, 2.0 ** (attempt - 1)) + random.uniform(0, 1)
+
 
 # ---------------------------------------------------------------------------
 # GitHub App authentication
 # ---------------------------------------------------------------------------
 
 
+# App JWTs are valid for 10 minutes; reuse one until this close to expiry
+JWT_EXPIRY_MARGIN = 60
+_jwt_cache: dict[str, tuple[str, int]] = {}
+
+
+@functools.lru_cache(maxsize=4)
+def _load_private_key(private_key: str) -> Any:
+    """Parse the App's PEM private key once per process."""
+    from cryptography.hazmat.primitives import serialization
+
+    return serialization.load_pem_private_key(private_key.encode(), password=None)
+
+
 def _generate_jwt(app_id: str, private_key: str) -> str:
-    """Generate a GitHub App JWT for API authentication."""
+    """Return a GitHub App JWT for API authentication.
+
+    The signed token is reused until ``JWT_EXPIRY_MARGIN`` seconds before it
+    expires, so RS256 signing happens at most once every ~9 minutes.
+    """
     import jwt as pyjwt
 
     now = int(time.time())
+    cached = _jwt_cache.get(app_id)
+    if cached and now < cached[1] - JWT_EXPIRY_MARGIN:
+        return cached[0]
+
     payload = {
         "iat": now - 60,
         "exp": now + (10 * 60),
         "iss": app_id,
     }
-    return pyjwt.encode(payload, private_key, algorithm="RS256")
+    token = pyjwt.encode(payload, _load_private_key(private_key), algorithm="RS256")
+    _jwt_cache[app_id] = (token, payload["exp"])
+    return token
 
 
 async def _get_installation_token(
@@ -55,18 +173,58 @@ async def _get_installation_token(
     private_key: str,
     installation_id: int,
 ) -> str | None:
-    """Exchange a JWT for an installation access token."""
+    """Return an installation access token, exchanging a JWT when needed.
+
+    Tokens are cached per installation until ``TOKEN_EXPIRY_MARGIN`` seconds
+    before their ``expires_at``; concurrent callers for the same installation
+    share a single refresh.
+    """
+    cached = _token_cache.get(installation_id)
+    if cached and time.time() < cached[1] - TOKEN_EXPIRY_MARGIN:
+        return cached[0]
+
+    lock = _token_locks.get(installation_id)
+    if lock is None:
+        lock = _token_locks[installation_id] = asyncio.Lock()
+    async with lock:
+        # Another coroutine may have refreshed it while we waited
+        cached = _token_cache.get(installation_id)
+        if cached and time.time() < cached[1] - TOKEN_EXPIRY_MARGIN:
+            return cached[0]
+        return await _request_installation_token(
+            client, app_id, private_key, installation_id
+        )
+
+
+async def _request_installation_token(
+    client: httpx.AsyncClient,
+    app_id: str,
+    private_key: str,
+    installation_id: int,
+) -> str | None:
+    """Exchange a JWT for an installation access token and cache it."""
     try:
         jwt_token = _generate_jwt(app_id, private_key)
-        resp = await client.post(
+        resp = await _github_request(
+            client,
+            "POST",
             f"{GITHUB_API}/app/installations/{installation_id}/access_tokens",
+            key=f"app:{app_id}",
             headers={
                 "Authorization": f"Bearer {jwt_token}",
                 "Accept": "application/vnd.github+json",
             },
         )
         resp.raise_for_status()
-        return resp.json().get("token")
+        data = jsonutil.loads(resp.content)
+        token = data.get("token")
+        if token:
+            try:
+                expires = datetime.fromisoformat(data["expires_at"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                expires = time.time() + 3600
+            _token_cache[installation_id] = (token, expires)
+        return token
     except Exception:
         logger.exception(
             "Failed to get installation token for installation %d", installation_id
@@ -78,27 +236,65 @@ async def _get_installation_token(
 # GitHub API helpers
 # ---------------------------------------------------------------------------
 
+# Diffs are read up to this size; dependency manifests in larger PRs past
+# the cut-off are not reported
+MAX_DIFF_BYTES = 4 * 1024 * 1024
+
 
 async def _fetch_pr_diff(
     client: httpx.AsyncClient,
     token: str,
     repo: str,
     pr_number: int,
-) -> str | None:
-    """Fetch the unified diff for a PR."""
+    etag: str | None = None,
+) -> tuple[str | None, str | None]:
+    """Fetch the unified diff for a PR.
+
+    Returns ``(diff, etag)``. When ``etag`` is given it is sent as
+    ``If-None-Match``; a 304 returns ``(None, etag)`` to signal that the diff
+    is unchanged. Failures return ``(None, None)``. The body is streamed and
+    cut off after ``MAX_DIFF_BYTES`` (at a line boundary).
+    """
+    headers = {
+        "Authorization": f"token {token}",
+        "Accept": "application/vnd.github.diff",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
     try:
-        resp = await client.get(
+        resp = await _github_request(
+            client,
+            "GET",
             f"{GITHUB_API}/repos/{repo}/pulls/{pr_number}",
-            headers={
-                "Authorization": f"token {token}",
-                "Accept": "application/vnd.github.diff",
-            },
+            key=token,
+            stream=True,
+            headers=headers,
         )
-        resp.raise_for_status()
-        return resp.text
+        try:
+            if etag and resp.status_code == 304:
+                return None, etag
+            resp.raise_for_status()
+            body = bytearray()
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_DIFF_BYTES:
+                    # Drop the rest of the transfer; a cut-off last line
+                    # could look like a different version, so end on a
+                    # complete one
+                    del body[body.rfind(b"\n", 0, MAX_DIFF_BYTES) + 1 :]
+                    logger.warning(
+                        "Diff for %s#%d exceeds %d bytes, truncated",
+                        repo,
+                        pr_number,
+                        MAX_DIFF_BYTES,
+                    )
+                    break
+            return body.decode("utf-8", errors="replace"), resp.headers.get("ETag")
+        finally:
+            await resp.aclose()
     except Exception:
         logger.exception("Failed to fetch diff for %s#%d", repo, pr_number)
-        return None
+        return None, None
 
 
 async def _post_pr_comment(
@@ -110,8 +306,12 @@ async def _post_pr_comment(
 ) -> str | None:
     """Post a comment on a PR. Returns the comment ID."""
     try:
-        resp = await client.post(
+        resp = await _github_request(
+            client,
+            "POST",
             f"{GITHUB_API}/repos/{repo}/issues/{pr_number}/comments",
+            key=token,
+            idempotent=False,
             headers={
                 "Authorization": f"token {token}",
                 "Accept": "application/vnd.github+json",
@@ -119,7 +319,7 @@ async def _post_pr_comment(
             json={"body": body},
         )
         resp.raise_for_status()
-        return str(resp.json().get("id", ""))
+        return str(jsonutil.loads(resp.content).get("id", ""))
     except Exception:
         logger.exception("Failed to post comment on %s#%d", repo, pr_number)
         return None
@@ -134,8 +334,11 @@ async def _update_pr_comment(
 ) -> bool:
     """Update an existing PR comment."""
     try:
-        resp = await client.patch(
+        resp = await _github_request(
+            client,
+            "PATCH",
             f"{GITHUB_API}/repos/{repo}/issues/comments/{comment_id}",
+            key=token,
             headers={
                 "Authorization": f"token {token}",
                 "Accept": "application/vnd.github+json",
@@ -153,59 +356,57 @@ async def _update_pr_comment(
 # Dependency extraction (re-uses logic from github_app router)
 # ---------------------------------------------------------------------------
 
-_NPM_DEP_PATTERN = re.compile(r'^\+\s*"([^"]+)"\s*:\s*"([^"]+)"', re.MULTILINE)
+# Each pattern runs once over a whole file section of the diff, so "+" is
+# anchored per line and no part of a match may cross a newline
+_NPM_DEP_PATTERN = re.compile(
+    r'^\+[ \t]*"([^"\n]+)"[ \t]*:[ \t]*"([^"\n]+)"', re.MULTILINE
+)
 _PIP_DEP_PATTERN = re.compile(r"^\+([a-zA-Z0-9_-]+)(?:[=<>!~]+(.+))?$", re.MULTILINE)
 _PYPROJECT_DEP_PATTERN = re.compile(
-    r'^\+\s*"([a-zA-Z0-9_-]+)(?:[=<>!~]+([^"]+))?"', re.MULTILINE
+    r'^\+[ \t]*"([a-zA-Z0-9_-]+)(?:[=<>!~]+([^"\n]+))?"', re.MULTILINE
 )
 
+# Splits a unified diff into [preamble, file, body, file, body, ...]
+_DIFF_FILE_SPLIT = re.compile(r"^diff --git.* b/(.*)$", re.MULTILINE)
 
-def _extract_new_dependencies(diff: str) -> list[dict[str, str]]:
-    """Parse a unified diff to extract newly added dependencies."""
-    deps: list[dict[str, str]] = []
-    current_file = ""
+# Diffs at least this long are parsed on a worker thread so the regex scan
+# does not hold up other events' I/O on the loop
+EXTRACT_IN_THREAD_CHARS = 256 * 1024
 
-    for line in diff.split("\n"):
-        if line.startswith("diff --git"):
-            parts = line.split(" b/")
-            current_file = parts[-1] if len(parts) > 1 else ""
-            continue
+# (manifest suffixes, pattern, ecosystem), checked in order per file
+_MANIFEST_PATTERNS: tuple[tuple[tuple[str, ...], re.Pattern[str], str], ...] = (
+    (("package.json",), _NPM_DEP_PATTERN, "npm"),
+    (("requirements.txt", "requirements-dev.txt"), _PIP_DEP_PATTERN, "pip"),
+    (("pyproject.toml",), _PYPROJECT_DEP_PATTERN, "pip"),
+)
 
-        if not line.startswith("+") or line.startswith("+++"):
-            continue
+# Every manifest name; a diff that mentions none of them has no deps to parse
+_DEP_FILENAMES = tuple(name for names, _, _ in _MANIFEST_PATTERNS for name in names)
 
-        if current_file.endswith("package.json"):
-            for match in _NPM_DEP_PATTERN.finditer(line):
-                deps.append(
-                    {
-                        "ecosystem": "npm",
-                        "name": match.group(1),
-                        "version": match.group(2),
-                        "file": current_file,
-                    }
-                )
 
-        elif current_file.endswith(("requirements.txt", "requirements-dev.txt")):
-            for match in _PIP_DEP_PATTERN.finditer(line):
-                deps.append(
-                    {
-                        "ecosystem": "pip",
-                        "name": match.group(1),
-                        "version": match.group(2) or "latest",
-                        "file": current_file,
-                    }
-                )
+def _extract_new_dependencies(diff: str) -> list[dict[str, str]]:
+    """Parse a unified diff to extract newly added dependencies."""
+    # Most PRs touch no manifest at all: a few substring searches settle it
+    # without splitting the diff
+    if not any(name in diff for name in _DEP_FILENAMES):
+        return []
+
+    deps: list[dict[str, str]] = []
+    sections = _DIFF_FILE_SPLIT.split(diff)
 
-        elif current_file.endswith("pyproject.toml"):
-            for match in _PYPROJECT_DEP_PATTERN.finditer(line):
-                deps.append(
+    for current_file, body in zip(sections[1::2], sections[2::2]):
+        for suffixes, pattern, ecosystem in _MANIFEST_PATTERNS:
+            if current_file.endswith(suffixes):
+                deps.extend(
                     {
-                        "ecosystem": "pip",
+                        "ecosystem": ecosystem,
                         "name": match.group(1),
                         "version": match.group(2) or "latest",
                         "file": current_file,
                     }
+                    for match in pattern.finditer(body)
                 )
+                break
 
     return deps
 
@@ -215,24 +416,97 @@ def _extract_new_dependencies(diff: str) -> list[dict[str, str]]:
 # ---------------------------------------------------------------------------
 
 
-async def _lookup_scan(
-    db: Any,
-    ecosystem: str,
-    name: str,
-) -> dict[str, Any] | None:
-    """Look up the latest scan result for a package from the public_scans table."""
-    try:
-        # Map "pip" ecosystem to "pypi" for DB lookup
-        eco = "pypi" if ecosystem == "pip" else ecosystem
-        rows = await db.select(
+# Row-value pairs per lookup query (two parameters each; SQL Server caps a
+# statement at 2100 parameters)
+_LOOKUP_CHUNK = 500
+
+_LOOKUP_SQL = """
+SELECT k.ecosystem, k.package_name, latest.verdict, latest.risk_score
+FROM (VALUES {values}) AS k (ecosystem, package_name)
+CROSS APPLY (
+    SELECT TOP 1 s.verdict, s.risk_score
+    FROM public_scans AS s
+    WHERE s.ecosystem = k.ecosystem
+    AND s.package_name = k.package_name
+    ORDER BY s.scanned_at DESC
+) AS latest
+"""
+
+
+def _db_ecosystem(ecosystem: str) -> str:
+    """Map the diff's "pip" ecosystem to the "pypi" used in public_scans."""
+    return "pypi" if ecosystem == "pip" else ecosystem
+
+
+# Per-batch memo of scan lookups shared by concurrently processed events:
+# (db ecosystem, package name) -> future resolving to the row (or None)
+ScanMemo = dict[tuple[str, str], "asyncio.Future[dict[str, Any] | None]"]
+
+
+async def _select_latest_scans(
+    db: Any, keys: list[tuple[str, str]]
+) -> list[dict[str, Any]]:
+    """Fetch the latest public_scans row for each (ecosystem, package) key."""
+    if db.connected:
+        sql = _LOOKUP_SQL.format(values=", ".join(["(?, ?)"] * len(keys)))
+        return await db.execute_raw_sql(sql, tuple(v for key in keys for v in key))
+
+    # In-memory store (no database configured): raw SQL is unavailable
+    rows: list[dict[str, Any]] = []
+    for ecosystem, name in keys:
+        rows += await db.select(
             "public_scans",
-            filters={"ecosystem": eco, "package_name": name},
+            filters={"ecosystem": ecosystem, "package_name": name},
             limit=1,
+            order_by="scanned_at",
+            order_desc=True,
         )
-        return rows[0] if rows else None
-    except Exception:
-        logger.debug("Scan lookup failed for %s/%s", ecosystem, name)
-        return None
+    return rows
+
+
+async def _lookup_scans(
+    db: Any,
+    deps: list[dict[str, str]],
+    memo: ScanMemo | None = None,
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """Look up the latest public_scans row for every dependency at once.
+
+    Returns rows keyed by (db ecosystem, package name); packages without a
+    scan (or a failed lookup) are simply absent. Packages already in ``memo``
+    (looked up, or being looked up, by another event in the same batch) are
+    not queried again.
+    """
+    keys = list(dict.fromkeys((_db_ecosystem(d["ecosystem"]), d["name"]) for d in deps))
+    if memo is None:
+        memo = {}
+    loop = asyncio.get_running_loop()
+    missing = [key for key in keys if key not in memo]
+    for key in missing:
+        memo[key] = loop.create_future()
+
+    try:
+        for i in range(0, len(missing), _LOOKUP_CHUNK):
+            chunk = missing[i : i + _LOOKUP_CHUNK]
+            try:
+                rows = await _select_latest_scans(db, chunk)
+            except Exception:
+                logger.debug("Scan lookup failed for %d packages", len(chunk))
+                rows = []
+            hits = {(row["ecosystem"], row["package_name"]): row for row in rows}
+            for key in chunk:
+                memo[key].set_result(hits.get(key))
+    finally:
+        # Never leave other events waiting on a lookup that was cancelled
+        for key in missing:
+            if not memo[key].done():
+                memo[key].set_result(None)
+
+    found: dict[tuple[str, str], dict[str, Any]] = {}
+    for key in keys:
+        row = await memo[key]
+        if row is not None:
+            found[key] = row
+    return found
 
 
 # ---------------------------------------------------------------------------
@@ -240,6 +514,17 @@ async def _lookup_scan(
 # ---------------------------------------------------------------------------
 
 
+_VERDICT_RANK = {"LOW_RISK": 0, "MEDIUM_RISK": 1, "HIGH_RISK": 2, "CRITICAL_RISK": 3}
+_RANK_TO_VERDICT = tuple(_VERDICT_RANK)
+
+_VERDICT_EMOJI = {
+    "LOW_RISK": ":white_check_mark:",
+    "MEDIUM_RISK": ":warning:",
+    "HIGH_RISK": ":x:",
+    "CRITICAL_RISK": ":rotating_light:",
+}
+
+
 def _format_comment(
     deps: list[dict[str, str]],
     scan_results: list[dict[str, Any]],
@@ -247,14 +532,7 @@ def _format_comment(
     overall_score: float,
 ) -> str:
     """Format the PR comment markdown."""
-    verdict_emoji = {
-        "LOW_RISK": ":white_check_mark:",
-        "MEDIUM_RISK": ":warning:",
-        "HIGH_RISK": ":x:",
-        "CRITICAL_RISK": ":rotating_light:",
-    }
-
-    emoji = verdict_emoji.get(overall_verdict, ":question:")
+    emoji = _VERDICT_EMOJI.get(overall_verdict, ":question:")
     lines = [f"## {emoji} Sigil Security Scan", ""]
 
     if not deps:
@@ -275,7 +553,7 @@ def _format_comment(
             dep_eco = result.get("ecosystem", "")
             dep_verdict = result.get("verdict", "LOW_RISK")
             dep_score = result.get("risk_score", 0.0)
-            dep_emoji = verdict_emoji.get(dep_verdict, ":question:")
+            dep_emoji = _VERDICT_EMOJI.get(dep_verdict, ":question:")
             dep_findings = result.get("findings", [])
 
             version_str = (
@@ -337,21 +615,32 @@ async def _process_pr_event(
     db: Any,
     client: httpx.AsyncClient,
     token: str,
+    scan_memo: ScanMemo | None = None,
 ) -> dict[str, Any]:
     """Process a single PR event: fetch diff, scan deps, post comment.
 
+    ``scan_memo`` shares scan lookups between the events of one batch.
     Returns a dict with the processing results to store back on the event row.
     """
     repo = event["repo"]
     pr_number = event["pr_number"]
+    existing_comment_id = event.get("comment_id")
 
-    # 1. Fetch PR diff
-    diff = await _fetch_pr_diff(client, token, repo, pr_number)
+    # 1. Fetch PR diff. Once a comment is up, a conditional request lets an
+    # unchanged diff (e.g. a reopened PR) skip the scan and comment entirely.
+    etag = event.get("diff_etag") if existing_comment_id else None
+    diff, diff_etag = await _fetch_pr_diff(client, token, repo, pr_number, etag)
+    if diff is None and diff_etag:
+        logger.info("PR %s#%d: diff unchanged, skipping", repo, pr_number)
+        return {"status": "skipped"}
     if not diff:
         return {"status": "error", "error": "Failed to fetch PR diff"}
 
     # 2. Extract new dependencies
-    deps = _extract_new_dependencies(diff)
+    if len(diff) >= EXTRACT_IN_THREAD_CHARS:
+        deps = await asyncio.to_thread(_extract_new_dependencies, diff)
+    else:
+        deps = _extract_new_dependencies(diff)
     logger.info(
         "PR %s#%d: found %d new dependencies",
         repo,
@@ -361,12 +650,10 @@ async def _process_pr_event(
 
     # 3. Look up scan results for each dependency
     scan_results: list[dict[str, Any]] = []
-    max_score = 0.0
-    worst_verdict = "LOW_RISK"
-    verdict_rank = {"LOW_RISK": 0, "MEDIUM_RISK": 1, "HIGH_RISK": 2, "CRITICAL_RISK": 3}
 
+    scans = await _lookup_scans(db, deps, scan_memo)
     for dep in deps:
-        scan = await _lookup_scan(db, dep["ecosystem"], dep["name"])
+        scan = scans.get((_db_ecosystem(dep["ecosystem"]), dep["name"]))
         if scan:
             result = {
                 "name": dep["name"],
@@ -390,17 +677,16 @@ async def _process_pr_event(
 
         scan_results.append(result)
 
-        dep_score = result.get("risk_score", 0.0)
-        dep_verdict = result.get("verdict", "LOW_RISK")
-        if dep_score > max_score:
-            max_score = dep_score
-        if verdict_rank.get(dep_verdict, 0) > verdict_rank.get(worst_verdict, 0):
-            worst_verdict = dep_verdict
+    max_score = max((r["risk_score"] for r in scan_results), default=0.0)
+    # Unranked verdicts count as LOW_RISK
+    worst_rank = max(
+        (_VERDICT_RANK.get(r["verdict"], 0) for r in scan_results), default=0
+    )
+    worst_verdict = _RANK_TO_VERDICT[worst_rank]
 
     # 4. Format and post comment
     comment_body = _format_comment(deps, scan_results, worst_verdict, max_score)
 
-    existing_comment_id = event.get("comment_id")
     if existing_comment_id:
         # Update existing comment (e.g., on synchronize events)
         ok = await _update_pr_comment(
@@ -415,6 +701,7 @@ async def _process_pr_event(
     return {
         "status": "completed" if comment_id else "error",
         "comment_id": comment_id,
+        "diff_etag": diff_etag if comment_id else None,
         "scan_results": {
             "dependencies": len(deps),
             "overall_verdict": worst_verdict,
@@ -429,17 +716,201 @@ async def _process_pr_event(
 # ---------------------------------------------------------------------------
 
 
+async def _wait_for_events(cache: Any, poll_interval: int, wakeup_timeout: int) -> bool:
+    """Sleep until the webhook handler signals a new PR event, or at most
+    ``wakeup_timeout`` seconds (the safety-net poll for missed signals).
+
+    Without Redis there are no signals, so this just waits ``poll_interval``;
+    the same happens when the blocking pop fails and returns early. Returns
+    True only when woken by a signal.
+    """
+    if not cache.connected:
+        await asyncio.sleep(poll_interval)
+        return False
+    started = time.monotonic()
+    if await cache.brpop(PR_EVENTS_WAKEUP_KEY, timeout=wakeup_timeout) is not None:
+        # Collapse a burst of signals into one wake-up: the next claim
+        # runs after this and picks up every event they announced, once the
+        # debounce window has let follow-up pushes land on the same rows.
+        await cache.delete(PR_EVENTS_WAKEUP_KEY)
+        await asyncio.sleep(PR_EVENT_DEBOUNCE_SECONDS + PR_EVENT_DEBOUNCE_SLACK_SECONDS)
+        return True
+    if time.monotonic() - started < wakeup_timeout:
+        # RedisClient.brpop returns None straight away when Redis is down;
+        # back off instead of re-running the claim in a tight loop
+        await asyncio.sleep(poll_interval)
+    return False
+
+
+# Claims the oldest pending events in one statement. READPAST skips rows
+# another worker has locked, so concurrent workers never claim the same event.
+_CLAIM_SQL = """
+WITH batch AS (
+    SELECT TOP (:batch_size) *
+    FROM github_pr_events WITH (ROWLOCK, UPDLOCK, READPAST)
+    WHERE status = 'pending'
+    AND created_at <= DATEADD(SECOND, -:debounce, SYSDATETIMEOFFSET())
+    ORDER BY created_at
+)
+UPDATE batch SET status = 'processing'
+OUTPUT inserted.*
+"""
+
+
+async def _claim_events(db: Any, batch_size: int) -> list[dict[str, Any]]:
+    """Mark up to ``batch_size`` pending events as processing and return them."""
+    if db.connected:
+        return await db.execute(
+            _CLAIM_SQL,
+            {"batch_size": batch_size, "debounce": PR_EVENT_DEBOUNCE_SECONDS},
+        )
+
+    # In-memory store (no database configured): single worker, no races
+    events = await db.select(
+        "github_pr_events",
+        filters={"status": "pending"},
+        limit=batch_size,
+        order_by="created_at",
+    )
+    for event in events:
+        await db.update(
+            "github_pr_events", {"id": event["id"]}, {"status": "processing"}
+        )
+    return events
+
+
+# Writes the outcomes of a batch in one statement. Optional columns are
+# NULL in the VALUES row when an event has nothing new for them, keeping
+# the stored value; the CASTs give NULL-only columns a concrete type. A row
+# re-queued by a push while it was being processed stays pending (keeping
+# the new comment_id/ETag) so the newer head is picked up next.
+_RECORD_SQL = """
+UPDATE t SET
+    t.status = CASE WHEN t.status = 'processing' THEN v.status ELSE t.status END,
+    t.processed_at = v.processed_at,
+    t.comment_id = COALESCE(v.comment_id, t.comment_id),
+    t.diff_etag = COALESCE(v.diff_etag, t.diff_etag),
+    t.scan_results = COALESCE(v.scan_results, t.scan_results)
+FROM github_pr_events AS t
+JOIN (VALUES {values}) AS v (
+    id, status, processed_at, comment_id, diff_etag, scan_results
+) ON t.id = v.id
+"""
+
+_RECORD_ROW = (
+    "(:id{i}, :status{i}, CAST(:processed_at{i} AS DATETIMEOFFSET), "
+    "CAST(:comment_id{i} AS NVARCHAR(100)), CAST(:diff_etag{i} AS NVARCHAR(255)), "
+    "CAST(:scan_results{i} AS NVARCHAR(MAX)))"
+)
+
+# Rows per statement (six parameters each; SQL Server caps a statement at
+# 2100 parameters)
+_RECORD_CHUNK = 300
+
+
+async def _record_outcomes(db: Any, outcomes: list[dict[str, Any]]) -> None:
+    """Write the status/results of processed events back to github_pr_events."""
+    if not db.connected:
+        # In-memory store (no database configured)
+        await asyncio.gather(
+            *(
+                db.update(
+                    "github_pr_events",
+                    {"id": outcome["id"]},
+                    {k: v for k, v in outcome.items() if k != "id"},
+                )
+                for outcome in outcomes
+            )
+        )
+        return
+
+    for start in range(0, len(outcomes), _RECORD_CHUNK):
+        chunk = outcomes[start : start + _RECORD_CHUNK]
+        values: dict[str, Any] = {}
+        for i, outcome in enumerate(chunk):
+            values[f"id{i}"] = outcome["id"]
+            values[f"status{i}"] = outcome["status"]
+            values[f"processed_at{i}"] = outcome["processed_at"]
+            for column in ("comment_id", "diff_etag", "scan_results"):
+                values[f"{column}{i}"] = outcome.get(column)
+        rows = ", ".join(_RECORD_ROW.format(i=i) for i in range(len(chunk)))
+        await db.execute(_RECORD_SQL.format(values=rows), values)
+
+
+async def _handle_event(
+    event: dict[str, Any],
+    db: Any,
+    client: httpx.AsyncClient,
+    settings: Any,
+    sem: asyncio.Semaphore,
+    scan_memo: ScanMemo,
+) -> dict[str, Any]:
+    """Process one claimed PR event.
+
+    Returns the event's outcome (``id`` plus the columns to update), which the
+    worker writes back together with the rest of the batch.
+    """
+    event_id = event.get("id", "")
+    installation_id = event.get("installation_id", 0)
+
+    async with sem:
+        # Get installation token
+        token = await _get_installation_token(
+            client,
+            settings.github_app_id,
+            settings.github_app_private_key,
+            installation_id,
+        )
+        if not token:
+            return {
+                "id": event_id,
+                "status": "error",
+                "processed_at": datetime.now(timezone.utc).isoformat(),
+            }
+
+        # Process the event
+        result = await _process_pr_event(event, db, client, token, scan_memo)
+
+    logger.info(
+        "PR event %s: %s (%s#%d)",
+        event_id,
+        result["status"],
+        event.get("repo", ""),
+        event.get("pr_number", 0),
+    )
+
+    outcome: dict[str, Any] = {
+        "id": event_id,
+        "status": result["status"],
+        "processed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if result.get("comment_id"):
+        outcome["comment_id"] = result["comment_id"]
+    if result.get("diff_etag"):
+        outcome["diff_etag"] = result["diff_etag"]
+    if result.get("scan_results"):
+        outcome["scan_results"] = jsonutil.dumps(result["scan_results"]).decode()
+    return outcome
+
+
 async def pr_comment_worker(
     poll_interval: int = 30,
     batch_size: int = 5,
+    concurrency: int | None = None,
+    wakeup_timeout: int = 300,
 ) -> None:
-    """Long-running worker that polls github_pr_events for pending events.
+    """Long-running worker that processes pending github_pr_events.
 
     Processes events in batches, posts PR comments, and updates event status.
+    Between batches it blocks on a wake-up from the webhook handler, polling
+    anyway after ``wakeup_timeout`` seconds in case a signal was missed. When
+    Redis is not configured it polls every ``poll_interval`` seconds, which is
+    also the back-off after a worker error. Events in a batch are handled
+    concurrently, at most ``concurrency`` (default ``batch_size``) at a time.
     Requires GitHub App credentials to be configured in the API settings.
     """
     from api.config import settings
-    from api.database import db
+    from api.database import cache, db
 
     if not settings.github_app_configured:
         logger.error(
@@ -448,88 +919,60 @@ async def pr_comment_worker(
         )
         return
 
+    await cache.connect()
+    sem = asyncio.Semaphore(concurrency or batch_size)
     logger.info("PR comment worker starting (poll_interval=%ds)", poll_interval)
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # One pooled HTTP/2 client for the worker's lifetime: token exchange,
+    # diff fetch and comment calls all multiplex on one api.github.com session
+    async with httpx.AsyncClient(
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=64,
+            max_keepalive_connections=32,
+            keepalive_expiry=90.0,
+        ),
+        headers={"User-Agent": f"Sigil/{settings.app_version}"},
+    ) as client:
+        woken = False
         while True:
             try:
-                # Fetch pending events
-                try:
-                    events = await db.select(
-                        "github_pr_events",
-                        filters={"status": "pending"},
-                        limit=batch_size,
-                        order_by="created_at",
-                        order_desc=False,
-                    )
-                except TypeError:
-                    events = await db.select(
-                        "github_pr_events",
-                        filters={"status": "pending"},
-                        limit=batch_size,
-                    )
+                events = await _claim_events(db, batch_size)
 
                 if not events:
-                    await asyncio.sleep(poll_interval)
+                    if woken:
+                        # The signalled row may still have been inside the
+                        # debounce window (clock skew, a later push); the
+                        # wake-up key is gone, so look once more shortly
+                        woken = False
+                        await asyncio.sleep(PR_EVENT_DEBOUNCE_SECONDS)
+                        continue
+                    woken = await _wait_for_events(cache, poll_interval, wakeup_timeout)
                     continue
 
                 logger.info("Processing %d pending PR events", len(events))
 
-                for event in events:
-                    event_id = event.get("id", "")
-                    installation_id = event.get("installation_id", 0)
-
-                    # Mark as processing
-                    await db.update(
-                        "github_pr_events",
-                        {"id": event_id},
-                        {"status": "processing"},
-                    )
-
-                    # Get installation token
-                    token = await _get_installation_token(
-                        client,
-                        settings.github_app_id,
-                        settings.github_app_private_key,
-                        installation_id,
-                    )
-                    if not token:
-                        await db.update(
-                            "github_pr_events",
-                            {"id": event_id},
-                            {
-                                "status": "error",
-                                "processed_at": datetime.now(timezone.utc).isoformat(),
-                            },
+                # Dependencies shared by several PRs are looked up once
+                scan_memo: ScanMemo = {}
+                results = await asyncio.gather(
+                    *(
+                        _handle_event(event, db, client, settings, sem, scan_memo)
+                        for event in events
+                    ),
+                    return_exceptions=True,
+                )
+                outcomes: list[dict[str, Any]] = []
+                for event, result in zip(events, results):
+                    if isinstance(result, BaseException):
+                        logger.error(
+                            "PR event %s failed",
+                            event.get("id", ""),
+                            exc_info=result,
                         )
-                        continue
-
-                    # Process the event
-                    result = await _process_pr_event(event, db, client, token)
-
-                    # Update event with results
-                    update_data: dict[str, Any] = {
-                        "status": result["status"],
-                        "processed_at": datetime.now(timezone.utc).isoformat(),
-                    }
-                    if result.get("comment_id"):
-                        update_data["comment_id"] = result["comment_id"]
-                    if result.get("scan_results"):
-                        update_data["scan_results"] = json.dumps(result["scan_results"])
-
-                    await db.update(
-                        "github_pr_events",
-                        {"id": event_id},
-                        update_data,
-                    )
-
-                    logger.info(
-                        "PR event %s: %s (%s#%d)",
-                        event_id,
-                        result["status"],
-                        event.get("repo", ""),
-                        event.get("pr_number", 0),
-                    )
+                    else:
+                        outcomes.append(result)
+                await _record_outcomes(db, outcomes)
 
             except Exception:
                 logger.exception("PR comment worker error")